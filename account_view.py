@@ -1,8 +1,9 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 from database import db
+from event_export import export_user_events
 from constants import INTEREST_TAGS
-from datetime import datetime, date
+from datetime import date
 
 
 class AccountPage(tk.Frame):
@@ -74,6 +75,9 @@ class AccountPage(tk.Frame):
         self.events_listbox.pack(side="left", fill="both", expand=True)
         scrollbar.config(command=self.events_listbox.yview)
 
+        self.export_button = tk.Button(self, text="Export My Club Events (.ics)", command=self.export_events)
+        self.export_button.pack(pady=5)
+
     def on_show(self):
         self.load_profile_data()
         self.load_user_events()
@@ -82,28 +86,62 @@ class AccountPage(tk.Frame):
         self.events_listbox.delete(0, tk.END)
         email = self.controller.current_user_email
         if email:
-            user_events = db.get_events_by_user_email(email)
-            today = date.today()
-
-            if user_events:
-                for evt in user_events:
-                    # Logic to determine status
-                    status = "[UPCOMING]"
-                    try:
-                        # Extract "2025-11-25" from "2025-11-25 | 6:00 PM - 8:00 PM"
-                        event_date_str = evt['time'].split('|')[0].strip()
-                        event_date = datetime.strptime(event_date_str, "%Y-%m-%d").date()
-
-                        if event_date < today:
-                            status = "[COMPLETED]"
-                    except Exception:
-                        status = "[UNKNOWN]"
-
-                    # Format: "[COMPLETED] Math Party | 2025-11-01... | IB 110"
-                    display_str = f"{status:<11} {evt['name']} | {evt['time']} | {evt['location']}"
-                    self.events_listbox.insert(tk.END, display_str)
-            else:
-                self.events_listbox.insert(tk.END, "No events found (Join a club and create one!)")
+            self.events_listbox.insert(tk.END, "Loading events...")
+            # Query runs on the DB worker; the listbox is filled in when it returns
+            self.controller.db_worker.submit(lambda manager: manager.get_events_by_user_email(email),
+                                             self.controller.profiler.track("AccountPage", "user_events",
+                                                                            self.show_user_events),
+                                             key="account-events")
+
+    def show_user_events(self, user_events):
+        self.events_listbox.delete(0, tk.END)
+        today_str = date.today().isoformat()
+
+        if isinstance(user_events, Exception):
+            self.events_listbox.insert(tk.END, "Could not load your events.")
+        elif user_events:
+            for evt in user_events:
+                # Logic to determine status
+                status = "[UPCOMING]"
+                if not evt['start']:
+                    status = "[UNKNOWN]"
+                # Compare the "2025-11-25" prefix of the stored start timestamp
+                elif evt['start'][:10] < today_str:
+                    status = "[COMPLETED]"
+
+                # Format: "[COMPLETED] Math Party | 2025-11-01... | IB 110"
+                display_str = f"{status:<11} {evt['name']} | {evt['time']} | {evt['location']}"
+                self.events_listbox.insert(tk.END, display_str)
+        else:
+            self.events_listbox.insert(tk.END, "No events found (Join a club and create one!)")
+
+    def export_events(self):
+        """Writes the upcoming events of the user's clubs to an .ics file other calendar apps can subscribe to."""
+        email = self.controller.current_user_email
+        if not email:
+            return
+        path = filedialog.asksaveasfilename(title="Export Events", defaultextension=".ics",
+                                            initialfile="club_events.ics",
+                                            filetypes=[("iCalendar files", "*.ics")])
+        if not path:
+            return
+
+        # A failed export reaches finish_export as the exception
+        self.export_button.configure(state="disabled")
+        self.controller.db_worker.submit(lambda manager: export_user_events(path, email, manager, upcoming=True),
+                                         lambda result: self.finish_export(path, result), key="event-export")
+
+    def finish_export(self, path, result):
+        self.export_button.configure(state="normal")
+        if isinstance(result, Exception):
+            messagebox.showerror("Export Failed", str(result))
+        else:
+            messagebox.showinfo("Export Finished", f"Exported {result} events to {path}")
+
+    def apply_changes(self, changes):
+        """Reloads the event list when another client changed events or club memberships."""
+        if any(table in ("events", "clubs", "user_clubs") for _, table, _, _ in changes):
+            self.load_user_events()
 
     def load_profile_data(self):
         """Fetches and displays the current user's data, setting checkbox states."""
@@ -0,0 +1,118 @@
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+
+class AuthService:
+    """
+    Password hashing and checking for the login and registration pages.
+
+    bcrypt is deliberately slow (hundreds of milliseconds at the default cost), so it runs on
+    a small thread pool instead of the Tk thread; bcrypt releases the GIL while it hashes.
+    Results are handed back to the Tk thread by a polling after() loop, like DBWorker.
+
+    rounds is the bcrypt work factor used for new hashes. A successful login whose stored hash
+    was made with a different cost is rehashed at the configured cost, so changing rounds
+    upgrades (or downgrades) passwords as users log in.
+
+    root may be None when only the synchronous methods (verify_login, hash_password) are used.
+    """
+    DEFAULT_ROUNDS = 12
+    POLL_MS = 20
+    MAX_PASSWORD_BYTES = 72  # bcrypt only uses (and since 5.0 only accepts) this many bytes
+
+    def __init__(self, root, manager, rounds=DEFAULT_ROUNDS, max_workers=2):
+        self.root = root
+        self.manager = manager
+        self.rounds = rounds
+
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth")
+        self.results = queue.Queue()
+        self._dummy_hash = None
+        if self.root is not None:
+            self.root.after(self.POLL_MS, self.poll)
+
+    def submit(self, job, callback=None, error=None):
+        """
+        Runs job() on the pool and calls callback(result) on the Tk thread when it's done.
+        If job raises, the error is printed and callback gets error instead, so callers can recover.
+        """
+        def run():
+            try:
+                result = job()
+            except Exception:
+                traceback.print_exc()
+                result = error
+            self.results.put((callback, result))
+
+        return self.pool.submit(run)
+
+    def poll(self):
+        """Delivers finished results on the Tk thread."""
+        try:
+            while True:
+                try:
+                    callback, result = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if callback is not None:
+                    callback(result)
+        finally:
+            self.root.after(self.POLL_MS, self.poll)
+
+    def login(self, email, password, callback):
+        """Checks a login in the background. callback gets the user's email, or None if it failed."""
+        self.submit(lambda: self.verify_login(email, password), callback, error=None)
+
+    def register(self, name, email, password, interests, callback):
+        """Hashes the password and creates the account in the background. callback gets True/False."""
+        self.submit(lambda: self.manager.register_user(name, email, self.hash_password(password), interests),
+                    callback, error=False)
+
+    def password_too_long(self, password):
+        return len(password.encode("utf-8")) > self.MAX_PASSWORD_BYTES
+
+    def hash_password(self, password):
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds))
+
+    def verify_login(self, email, password):
+        """
+        Checks email and password, rehashing the password if it was hashed at another cost.
+        Runs on the calling thread. Returns the email if the login is valid, None otherwise.
+        """
+        if self.password_too_long(password):
+            # No account can have one, and bcrypt would raise
+            return None
+
+        stored_hash = self.manager.get_password_hash(email)
+        if stored_hash is None:
+            # Hash anyway, so an unknown email takes as long to reject as a wrong password
+            bcrypt.checkpw(password.encode("utf-8"), self.dummy_hash())
+            return None
+
+        if isinstance(stored_hash, str):
+            stored_hash = stored_hash.encode("utf-8")
+        if not bcrypt.checkpw(password.encode("utf-8"), stored_hash):
+            return None
+
+        if hash_rounds(stored_hash) != self.rounds:
+            self.manager.update_password_hash(email, self.hash_password(password))
+        return email
+
+    def dummy_hash(self):
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash_password("not a real password")
+        return self._dummy_hash
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def hash_rounds(hashed):
+    """Returns the cost factor of a bcrypt hash, e.g. 12 for b"$2b$12$..."."""
+    try:
+        return int(hashed.split(b"$")[2])
+    except (IndexError, ValueError):
+        return None
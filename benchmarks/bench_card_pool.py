@@ -0,0 +1,105 @@
+"""
+Benchmark for refreshing the calendar feed's event cards.
+
+Compares destroying and rebuilding every card (the old refresh_events path) with
+reconfiguring pooled EventCard widgets in place. Needs a display to create Tk widgets.
+Run from the project root:
+
+    python -m benchmarks.bench_card_pool [card counts...]
+"""
+import sys
+import time
+import tkinter as tk
+
+from constants import INTEREST_TAGS
+from event_feed import EventCard
+
+DEFAULT_COUNTS = [100, 1_000]
+REFRESHES = 5
+
+
+def make_events(count, refresh):
+    """Returns count fake events; refresh changes the text so every refresh shows new data."""
+    return [{
+        "id": i,
+        "name": f"Event {i} (refresh {refresh})",
+        "club": f"Club {i % 50}",
+        "description": "Benchmark event " * (i % 5),
+        "time": "2025-11-25 | 6:00 PM - 8:00 PM",
+        "location": "IB 110",
+        "tags": INTEREST_TAGS[:i % 4]
+    } for i in range(count)]
+
+
+def legacy_create_event_card(parent, event):
+    """The card builder used before pooling: a new frame and labels per event."""
+    card = tk.Frame(parent, bg="#f9f9f9", bd=1, relief="solid")
+    card.pack(fill="x", padx=20, pady=10)
+    header = tk.Frame(card, bg="#e0e0e0")
+    header.pack(fill="x")
+    tk.Label(header, text=event['name'], font=("Arial", 12, "bold"), bg="#e0e0e0").pack(side="left", padx=10, pady=5)
+    tk.Label(header, text=event['time'], font=("Arial", 10, "italic"), bg="#e0e0e0").pack(side="right", padx=10)
+    body = tk.Frame(card, bg="#f9f9f9")
+    body.pack(fill="x", padx=10, pady=5)
+    tk.Label(body, text=f"Hosted by: {event['club']}", fg="#003366", bg="#f9f9f9").pack(anchor="w")
+    tk.Label(body, text=f"📍 {event['location']}", fg="#555", bg="#f9f9f9").pack(anchor="w")
+    tk.Label(body, text=event['description'], wraplength=400, justify="left", bg="#f9f9f9").pack(anchor="w", pady=5)
+    if event['tags']:
+        tk.Label(card, text=f"Tags: {' | '.join(event['tags'])}", bg="#f9f9f9", fg="blue",
+                 font=("Arial", 8)).pack(anchor="w", padx=10, pady=(0, 5))
+
+
+def time_refreshes(root, refresh):
+    """Runs refresh(n) REFRESHES times and returns the average time per refresh in seconds."""
+    total = 0.0
+    for n in range(REFRESHES):
+        start = time.perf_counter()
+        refresh(n)
+        root.update_idletasks()  # include geometry management in the measurement
+        total += time.perf_counter() - start
+    return total / REFRESHES
+
+
+def run(counts):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Cannot create a Tk window ({e}); this benchmark needs a display.")
+        return
+    root.withdraw()
+
+    print(f"{'cards':>6} {'rebuild (ms)':>13} {'pooled (ms)':>12} {'speedup':>8}")
+    for count in counts:
+        frame = tk.Frame(root)
+
+        def rebuild(n):
+            for widget in frame.winfo_children():
+                widget.destroy()
+            for event in make_events(count, n):
+                legacy_create_event_card(frame, event)
+
+        pool = []
+
+        def pooled(n):
+            events = make_events(count, n)
+            while len(pool) < len(events):
+                card = EventCard(frame)
+                card.pack(fill="x", padx=20, pady=10)
+                pool.append(card)
+            for card, event in zip(pool, events):
+                card.show(event)
+
+        before = time_refreshes(root, rebuild)
+        for widget in frame.winfo_children():
+            widget.destroy()
+        pooled(0)  # build the pool once, as the feed does on its first refresh
+        after = time_refreshes(root, pooled)
+        frame.destroy()
+
+        print(f"{count:>6} {before * 1000:>13.1f} {after * 1000:>12.1f} {before / after:>7.1f}x")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_COUNTS)
@@ -0,0 +1,105 @@
+"""
+Benchmark for deleting the account of an officer who is admin of many clubs.
+
+Compares the old per-club loop (up to four queries per club) with the set-based
+DBManager.delete_user_account. Half of the officer's clubs have no other admin and are
+deleted with their events, the other half have a co-admin who takes over as contact.
+Run from the project root:
+
+    python -m benchmarks.bench_delete_account [club counts...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from database import DBManager, parse_time_frame
+
+DEFAULT_COUNTS = [1, 100, 1_000]
+EVENTS_PER_CLUB = 10
+REPEATS = 3
+OFFICER = "officer@utm.ca"
+CO_ADMIN = "coadmin@utm.ca"
+
+
+def populate(manager, num_clubs):
+    """Makes OFFICER the admin and contact of num_clubs clubs, every other one also run by CO_ADMIN."""
+    clubs = [f"Club {i}" for i in range(num_clubs)]
+    time_frame = "2026-05-01 | 6:00 PM - 8:00 PM"
+
+    c = manager.conn.cursor()
+    c.executemany("INSERT INTO users(name, email, password) VALUES (?, ?, ?)",
+                  [("Officer", OFFICER, b""), ("Co-admin", CO_ADMIN, b"")])
+    c.executemany("INSERT INTO clubs(club_name, club_email, club_description) VALUES (?, ?, ?)",
+                  [(club, OFFICER, "") for club in clubs])
+    c.executemany("INSERT INTO user_clubs(user_email, club, role) VALUES (?, ?, 'admin')",
+                  [(OFFICER, club) for club in clubs] + [(CO_ADMIN, club) for club in clubs[1::2]])
+    c.executemany("INSERT INTO events(event_name, host_club, description, time_frame, location, start_ts, end_ts) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                  [(f"{club} event {n}", club, "Benchmark event", time_frame, "IB 110", *parse_time_frame(time_frame))
+                   for club in clubs for n in range(EVENTS_PER_CLUB)])
+    manager.conn.commit()
+
+
+def legacy_delete_user_account(manager, email):
+    """The previous implementation: count admins, read the contact, pick a replacement and update, per club."""
+    c = manager.conn.cursor()
+    c.execute("SELECT club FROM user_clubs WHERE user_email = ? AND role = 'admin'", (email,))
+    for club_name in [row[0] for row in c.fetchall()]:
+        c.execute("SELECT count(*) FROM user_clubs WHERE club = ? AND role = 'admin'", (club_name,))
+        if c.fetchone()[0] == 1:
+            c.execute("DELETE FROM clubs WHERE club_name = ?", (club_name,))
+        else:
+            c.execute("SELECT club_email FROM clubs WHERE club_name = ?", (club_name,))
+            if c.fetchone()[0] == email:
+                c.execute("SELECT user_email FROM user_clubs WHERE club = ? AND role = 'admin' AND user_email != ?",
+                          (club_name, email))
+                c.execute("UPDATE clubs SET club_email = ? WHERE club_name = ?", (c.fetchone()[0], club_name))
+    c.execute("DELETE FROM users WHERE email = ?", (email,))
+    manager.conn.commit()
+    return True
+
+
+def clubs_after(manager):
+    return manager.conn.execute("SELECT club_name, club_email FROM clubs ORDER BY club_name").fetchall()
+
+
+def best_delete(delete, num_clubs, repeats=REPEATS):
+    """
+    Returns the fastest time (in seconds) of delete(manager, OFFICER) on a freshly populated
+    database, and the clubs left after the last run.
+    """
+    best = None
+    remaining = None
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = DBManager(os.path.join(tmp, "bench.db"))
+            populate(manager, num_clubs)
+            start = time.perf_counter()
+            if not delete(manager, OFFICER):
+                raise AssertionError("delete_user_account failed")
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            remaining = clubs_after(manager)
+            manager.close()
+    return best, remaining
+
+
+def run(counts):
+    print(f"{'clubs':>6} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+    for count in counts:
+        # Silence DBManager's connection and deletion messages
+        with contextlib.redirect_stdout(io.StringIO()):
+            before, legacy_result = best_delete(legacy_delete_user_account, count)
+            after, result = best_delete(lambda manager, email: manager.delete_user_account(email), count)
+
+        if result != legacy_result:
+            raise AssertionError(f"delete_user_account left different clubs at {count} admin clubs")
+
+        print(f"{count:>6} {before * 1000:>12.2f} {after * 1000:>12.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_COUNTS)
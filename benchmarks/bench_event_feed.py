@@ -0,0 +1,100 @@
+"""
+Benchmark for loading the calendar event feed.
+
+Compares the old N+1 loader (one tag query per event) with DBManager.get_all_events.
+Run from the project root:
+
+    python -m benchmarks.bench_event_feed [sizes...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from constants import INTEREST_TAGS
+from database import DBManager, parse_time_frame
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+NUM_CLUBS = 50
+REPEATS = 3
+
+
+def populate(manager, num_events, seed=0):
+    """Fills the database with num_events events spread over NUM_CLUBS clubs."""
+    rng = random.Random(seed)
+    clubs = [f"Club {i}" for i in range(NUM_CLUBS)]
+
+    c = manager.conn.cursor()
+    c.executemany("INSERT INTO clubs(club_name, club_email, club_description) VALUES (?, ?, ?)",
+                  [(club, f"club{i}@utm.ca", "") for i, club in enumerate(clubs)])
+
+    events = []
+    tags = []
+    for event_id in range(1, num_events + 1):
+        day = f"{rng.randint(2025, 2027)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        time_frame = f"{day} | 6:00 PM - 8:00 PM"
+        events.append((event_id, f"Event {event_id}", rng.choice(clubs), "Benchmark event",
+                       time_frame, "IB 110", *parse_time_frame(time_frame)))
+        for tag in rng.sample(INTEREST_TAGS, rng.randint(0, 3)):
+            tags.append((event_id, tag))
+
+    c.executemany("INSERT INTO events(id, event_name, host_club, description, time_frame, location, "
+                  "start_ts, end_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", events)
+    c.executemany("INSERT INTO event_interests(event_id, interest_tag) VALUES (?, ?)", tags)
+    manager.conn.commit()
+
+
+def legacy_get_all_events(manager):
+    """The previous loader: one event_interests query per event row."""
+    c = manager.conn.cursor()
+    c.execute("SELECT * FROM events ORDER BY time_frame")
+    events_list = []
+    for row in c.fetchall():
+        c_tag = manager.conn.cursor()
+        c_tag.execute("SELECT interest_tag FROM event_interests WHERE event_id = ?", (row[0],))
+        events_list.append({
+            "id": row[0],
+            "name": row[1],
+            "club": row[2],
+            "description": row[3],
+            "time": row[4],
+            "location": row[5],
+            "tags": [t[0] for t in c_tag.fetchall()]
+        })
+    return events_list
+
+
+def best_of(func, repeats=REPEATS):
+    """Returns the fastest wall-clock time (in seconds) and the last result of func()."""
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(sizes):
+    print(f"{'events':>8} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = DBManager(os.path.join(tmp, "bench.db"))
+            populate(manager, size)
+
+            before, legacy_result = best_of(lambda: legacy_get_all_events(manager))
+            # Measure SQLite work, not DBManager's read cache
+            after, result = best_of(lambda: (manager.invalidate_cache(), manager.get_all_events())[1])
+            manager.close()
+
+        # The new loader orders chronologically by start_ts, so compare the tags per event
+        if {e["id"]: e["tags"] for e in result} != {e["id"]: e["tags"] for e in legacy_result}:
+            raise AssertionError(f"get_all_events returned a different feed at {size} events")
+
+        print(f"{size:>8} {before * 1000:>12.1f} {after * 1000:>12.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
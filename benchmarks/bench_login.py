@@ -0,0 +1,61 @@
+"""
+Benchmark for login latency at different bcrypt work factors.
+
+For each cost it measures a login against a hash made at that cost, a rejected login, and
+the first login after the configured cost was raised by one (check at the old cost plus a
+rehash at the new one). Run from the project root:
+
+    python -m benchmarks.bench_login [costs...]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from auth_service import AuthService
+from database import DBManager
+
+DEFAULT_COSTS = [4, 8, 10, 12, 13, 14]
+REPEATS = 5
+EMAIL = "bench@utm.ca"
+PASSWORD = "correct horse battery staple"
+
+
+def median_ms(func, repeats=REPEATS):
+    """Returns the median wall-clock time of func() in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run(costs):
+    print(f"{'cost':>4} {'login (ms)':>11} {'rejected (ms)':>14} {'login + rehash (ms)':>20}")
+    for cost in costs:
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = DBManager(os.path.join(tmp, "bench.db"))
+            auth = AuthService(None, manager, rounds=cost)
+            manager.register_user("Bench", EMAIL, auth.hash_password(PASSWORD), [])
+
+            login = median_ms(lambda: auth.verify_login(EMAIL, PASSWORD))
+            rejected = median_ms(lambda: auth.verify_login(EMAIL, "wrong password"))
+
+            # Each login rehashes from cost to cost + 1, so put the old hash back every time
+            old_hash = manager.get_password_hash(EMAIL)
+            upgraded = AuthService(None, manager, rounds=cost + 1)
+
+            def login_and_rehash():
+                manager.update_password_hash(EMAIL, old_hash)
+                upgraded.verify_login(EMAIL, PASSWORD)
+
+            rehash = median_ms(login_and_rehash)
+            manager.close()
+
+        print(f"{cost:>4} {login:>11.1f} {rejected:>14.1f} {rehash:>20.1f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_COSTS)
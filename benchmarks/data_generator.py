@@ -0,0 +1,138 @@
+"""
+Reproducible synthetic data for benchmarks and manual testing.
+
+Club sizes follow a Zipf-like distribution: a few huge clubs that most users belong to and
+a long tail of small ones. Bigger clubs also host more events. Tags and interests are
+skewed the same way (some tags are much more common than others). Every club gets an
+admin, who is also its contact email, so account deletion exercises the ownership rules.
+
+The same seed always produces the same data. All users share one password (PASSWORD),
+hashed once at a low bcrypt cost so generating 50k users stays fast.
+
+Fill a database file from the project root:
+
+    python -m benchmarks.data_generator events.db --users 1000 --clubs 50 --events 10000
+"""
+import argparse
+import random
+from datetime import date, datetime, time, timedelta
+
+import bcrypt
+
+from constants import INTEREST_TAGS
+from database import DBManager, format_time_frame, parse_time_frame, tag_mask
+
+PASSWORD = "password"
+CLUB_SKEW = 1.1  # Zipf exponent of club popularity
+TAG_SKEW = 0.8  # Zipf exponent of tag popularity
+DAYS_BEFORE = 365  # Events are spread from a year ago ...
+DAYS_AFTER = 365  # ... to a year from now
+
+
+def zipf_weights(count, exponent):
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def generate(manager, users=1_000, clubs=50, events=10_000, memberships_per_user=3, seed=0, today=None):
+    """
+    Fills an empty database with synthetic users, clubs, memberships, events and tags.
+    Returns a dict describing what was generated:
+        user_emails   all user emails
+        club_names    all club names, most popular first
+        admins        club name -> email of its admin
+        event_ids     ids of the generated events
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    password_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=4))
+
+    user_emails = [f"user{i}@utm.ca" for i in range(users)]
+    club_names = [f"Club {i}" for i in range(clubs)]
+    club_weights = zipf_weights(clubs, CLUB_SKEW)
+    tag_weights = zipf_weights(len(INTEREST_TAGS), TAG_SKEW)
+
+    # Users and their interests
+    user_rows = []
+    interest_rows = []
+    for i, email in enumerate(user_emails):
+        interests = _sample_weighted(rng, INTEREST_TAGS, tag_weights, rng.randint(1, 4))
+        user_rows.append((f"User {i}", email, password_hash, tag_mask(interests)))
+        interest_rows.extend((email, tag) for tag in interests)
+
+    # Every club has an admin, who is its contact person
+    admins = {club: rng.choice(user_emails) for club in club_names}
+    club_rows = [(club, admins[club], f"Synthetic club number {i}") for i, club in enumerate(club_names)]
+    membership = {(email, club): "admin" for club, email in admins.items()}
+
+    # Memberships: roughly memberships_per_user clubs per user, picked by popularity
+    for email in user_emails:
+        count = min(clubs, max(1, int(rng.expovariate(1 / memberships_per_user))))
+        for club in _sample_weighted(rng, club_names, club_weights, count):
+            membership.setdefault((email, club), "member")
+    membership_rows = [(email, club, role) for (email, club), role in membership.items()]
+
+    # Events, hosted in proportion to club popularity
+    event_rows = []
+    event_tag_rows = []
+    hosts = rng.choices(club_names, weights=club_weights, k=events)
+    for event_id, club in enumerate(hosts, start=1):
+        day = today + timedelta(days=rng.randint(-DAYS_BEFORE, DAYS_AFTER))
+        start = datetime.combine(day, time(rng.randint(9, 20), rng.choice((0, 15, 30, 45))))
+        end = start + timedelta(minutes=rng.choice((60, 90, 120, 180)))
+        time_frame = format_time_frame(day, start.time(), end.time())
+        tags = _sample_weighted(rng, INTEREST_TAGS, tag_weights, rng.randint(0, 3))
+
+        event_rows.append((event_id, f"{club} event {event_id}", club,
+                           f"Synthetic event {event_id} hosted by {club}.", time_frame,
+                           f"Room {rng.randint(100, 399)}", *parse_time_frame(time_frame), tag_mask(tags)))
+        event_tag_rows.extend((event_id, tag) for tag in tags)
+
+    c = manager.conn.cursor()
+    c.execute("BEGIN")
+    c.executemany("INSERT INTO users(name, email, password, interest_mask) VALUES (?, ?, ?, ?)", user_rows)
+    c.executemany("INSERT INTO user_interests(user_email, interest_tag) VALUES (?, ?)", interest_rows)
+    c.executemany("INSERT INTO clubs(club_name, club_email, club_description) VALUES (?, ?, ?)", club_rows)
+    c.executemany("INSERT INTO user_clubs(user_email, club, role) VALUES (?, ?, ?)", membership_rows)
+    c.executemany("INSERT INTO events(id, event_name, host_club, description, time_frame, location, "
+                  "start_ts, end_ts, tag_mask) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", event_rows)
+    c.executemany("INSERT INTO event_interests(event_id, interest_tag) VALUES (?, ?)", event_tag_rows)
+    manager.conn.commit()
+    manager.invalidate_cache()
+
+    return {
+        "user_emails": user_emails,
+        "club_names": club_names,
+        "admins": admins,
+        "event_ids": list(range(1, events + 1)),
+    }
+
+
+def _sample_weighted(rng, items, weights, count):
+    """Picks count distinct items, more popular (higher weight) items more often."""
+    picked = []
+    while len(picked) < min(count, len(items)):
+        item = rng.choices(items, weights=weights)[0]
+        if item not in picked:
+            picked.append(item)
+    return picked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill an events database with synthetic data.")
+    parser.add_argument("db_file", help="database file to create or fill (it should have no data yet)")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--clubs", type=int, default=50)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--memberships", type=float, default=3, help="average clubs per user")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manager = DBManager(args.db_file)
+    generate(manager, args.users, args.clubs, args.events, args.memberships, args.seed)
+    manager.close()
+    print(f"Generated {args.users} users, {args.clubs} clubs and {args.events} events in {args.db_file}. "
+          f"Every user's password is {PASSWORD!r}.")
+
+
+if __name__ == "__main__":
+    main()
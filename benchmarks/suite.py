@@ -0,0 +1,157 @@
+"""
+Benchmark suite for DBManager's hot paths at several data sizes.
+
+Each scale is generated with benchmarks.data_generator into a temporary database, then every
+benchmark is timed REPEATS times with DBManager's read cache cleared before each run, so the
+numbers are SQLite work rather than cache hits. Results are written as JSON (one record per
+scale and benchmark) so runs can be compared over time. Run from the project root:
+
+    python -m benchmarks.suite [--scales small medium] [--repeats 5] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.data_generator import generate
+from database import DBManager
+
+SCALES = {
+    "small": dict(users=1_000, clubs=50, events=5_000),
+    "medium": dict(users=10_000, clubs=200, events=50_000),
+    "large": dict(users=50_000, clubs=500, events=100_000),
+}
+DEFAULT_SCALES = ["small", "medium"]
+REPEATS = 5
+
+
+def benchmarks(manager, data):
+    """
+    Returns (name, setup, func) triples. setup() runs untimed before each func() call and
+    returns its argument, so destructive benchmarks can pick fresh rows every run.
+    """
+    emails = data["user_emails"]
+    clubs = data["club_names"]
+    admins = data["admins"]
+    admin_emails = set(admins.values())
+
+    # A member of the biggest club, and the users that can be deleted without touching clubs
+    big_club_member = admins[clubs[0]]
+    members = iter(email for email in reversed(emails) if email not in admin_emails)
+    small_club_admins = iter(admins[club] for club in reversed(clubs))
+    event = manager.query_events(ids=[data["event_ids"][len(data["event_ids"]) // 2]])[0]
+    toggle = {"on": False}
+
+    def toggle_club(email):
+        # Alternates between joining and leaving the smallest club
+        toggle["on"] = not toggle["on"]
+        current = manager.get_user_clubs(email)
+        wanted = current + [clubs[-1]] if toggle["on"] else [c for c in current if c != clubs[-1]]
+        return manager.update_user_clubs(email, wanted)
+
+    def edit_event(n):
+        return manager.update_event(event["id"], event["name"], event["club"], f"Edited {n}",
+                                    event["time"], event["location"], event["tags"])
+
+    counter = iter(range(1_000_000))
+    return [
+        ("get_all_events", None, lambda _: manager.get_all_events()),
+        ("get_events_by_user_email", None, lambda _: manager.get_events_by_user_email(big_club_member)),
+        ("calendar_upcoming_first_page", None,
+         lambda _: (manager.count_events(upcoming=True), manager.query_events(upcoming=True, limit=50))),
+        ("calendar_filter_tags_clubs", None,
+         lambda _: manager.query_events(tags=["Social", "Free Food"], clubs=clubs[:5], upcoming=True, limit=50)),
+        ("calendar_filter_all_tags", None,
+         lambda _: manager.count_events(tags=["Social", "Free Food"], tag_mode="all", upcoming=True)),
+        ("calendar_deep_page", None,
+         lambda _: manager.query_events(upcoming=True, limit=50, offset=manager.count_events(upcoming=True) // 2)),
+        ("calendar_search", None, lambda _: manager.search_events("club event", upcoming=True)),
+        ("recommend_events", None, lambda _: manager.recommend_events(big_club_member)),
+        ("update_user_clubs", None, lambda _: toggle_club(big_club_member)),
+        ("update_event", lambda: next(counter), edit_event),
+        ("delete_user_account_member", lambda: next(members), manager.delete_user_account),
+        ("delete_user_account_club_admin", lambda: next(small_club_admins), manager.delete_user_account),
+    ]
+
+
+def time_benchmark(manager, setup, func, repeats):
+    """Returns the wall-clock times of repeats calls in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        argument = setup() if setup else None
+        manager.invalidate_cache()
+        start = time.perf_counter()
+        func(argument)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, repeats=REPEATS, seed=0):
+    results = []
+    for scale in scales:
+        sizes = SCALES[scale]
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = DBManager(os.path.join(tmp, "bench.db"))
+            start = time.perf_counter()
+            data = generate(manager, **sizes, seed=seed)
+            print(f"[{scale}] generated {sizes} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+            for name, setup, func in benchmarks(manager, data):
+                times = time_benchmark(manager, setup, func, repeats)
+                results.append({
+                    "scale": scale,
+                    **sizes,
+                    "benchmark": name,
+                    "repeats": repeats,
+                    "median_ms": round(statistics.median(times), 3),
+                    "min_ms": round(min(times), 3),
+                    "max_ms": round(max(times), 3),
+                })
+                print(f"[{scale}] {name:<32} {statistics.median(times):10.2f} ms", file=sys.stderr)
+            manager.close()
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time DBManager hot paths on synthetic data.")
+    parser.add_argument("--scales", nargs="+", choices=sorted(SCALES), default=DEFAULT_SCALES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args.scales, args.repeats, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,21 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from database import db
 from constants import INTEREST_TAGS
 from tkcalendar import DateEntry
-from datetime import datetime, date
+from event_feed import EventFeed
 
 
 class CalendarPage(tk.Frame):
+    SEARCH_LIMIT = 200  # Best matches shown for a text search
+    FOR_YOU_LIMIT = 100  # Top ranked events shown in the "For You" feed
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
 
         self.tag_vars = []
         self.club_vars = []
+        self.current_filters = {}  # filters of the events shown in the feed
+        self.current_ranked = False  # True while the feed shows a ranked list (search or "For You")
 
         # Grid layout: Row 0=Nav, Row 1=Body
         self.grid_rowconfigure(1, weight=1)
@@ -44,6 +47,17 @@ class CalendarPage(tk.Frame):
 
         tk.Label(sidebar, text="Event Filters", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(pady=10)
 
+        # Text Search (name, description, location and club)
+        tk.Label(sidebar, text="Search:", bg="#f0f0f0", anchor="w").pack(fill="x", padx=10)
+        self.search_entry = tk.Entry(sidebar)
+        self.search_entry.pack(fill="x", padx=10, pady=(0, 10))
+        self.search_entry.bind("<Return>", lambda e: self.refresh_events())
+
+        # Personalized Feed: upcoming events ranked by the user's interests, clubs and how soon they start
+        self.for_you_var = tk.IntVar()
+        tk.Checkbutton(sidebar, text="For You (ranked)", variable=self.for_you_var, bg="#f0f0f0",
+                       command=self.refresh_events).pack(anchor="w", padx=10, pady=(0, 10))
+
         # Date Filters
         tk.Label(sidebar, text="Filter by Date:", bg="#f0f0f0", anchor="w").pack(fill="x", padx=10)
 
@@ -75,12 +89,22 @@ class CalendarPage(tk.Frame):
             c = i % 2
             tk.Checkbutton(tag_frame, text=tag, variable=var, bg="#f0f0f0").grid(row=r, column=c, sticky="w")
 
+        # Whether an event needs any or all of the selected tags
+        self.tag_mode_var = tk.StringVar(value="any")
+        tag_mode_frame = tk.Frame(sidebar, bg="#f0f0f0")
+        tag_mode_frame.pack(padx=10, fill="x")
+        tk.Label(tag_mode_frame, text="Match:", bg="#f0f0f0").pack(side="left")
+        tk.Radiobutton(tag_mode_frame, text="Any tag", variable=self.tag_mode_var, value="any",
+                       bg="#f0f0f0").pack(side="left")
+        tk.Radiobutton(tag_mode_frame, text="All tags", variable=self.tag_mode_var, value="all",
+                       bg="#f0f0f0").pack(side="left")
+
         # 3. Clubs Filter (2 Columns)
         tk.Label(sidebar, text="By Host Club:", bg="#f0f0f0", anchor="w").pack(fill="x", padx=10, pady=(15, 0))
         club_frame = tk.Frame(sidebar, bg="#f0f0f0")
         club_frame.pack(padx=10, fill="x", pady=5)
         self.club_frame = club_frame
-        self.club_filters(club_frame)
+        self.club_filters()
 
         # Buttons
         tk.Button(sidebar, text="Apply Filters", command=self.refresh_events, bg="#003366", fg="white").pack(pady=20)
@@ -90,43 +114,43 @@ class CalendarPage(tk.Frame):
         content_frame = tk.Frame(self, bg="white")
         content_frame.grid(row=1, column=1, sticky="nsew")
 
-        self.canvas = tk.Canvas(content_frame, bg="white")
-        scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas, bg="white")
-
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-
-        self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Header for the feed
-        self.header_label = tk.Label(self.scrollable_frame, text="Upcoming Events", font=("Arial", 16), bg="white")
-        self.header_label.pack(pady=10, padx=20, anchor="w")
-
-    def club_filters(self, club_frame):
-        # We fetch clubs dynamically
-        clubs = db.get_club_names()
+        # Only the cards near the viewport are built, see EventFeed
+        self.feed = EventFeed(content_frame)
+        self.feed.pack(fill="both", expand=True)
+
+    def club_filters(self):
+        # We fetch clubs dynamically, on the DB worker
+        self.controller.db_worker.submit(lambda manager: manager.get_club_names(),
+                                         self.controller.profiler.track("CalendarPage", "club_filters",
+                                                                        self.show_club_filters),
+                                         key="calendar-clubs")
+
+    def show_club_filters(self, clubs):
+        """(Re)builds the club checkboxes, keeping the selection. Nothing is rebuilt if the clubs didn't change."""
+        if isinstance(clubs, Exception):
+            return  # Keep the current checkboxes
         if not clubs: clubs = []
+        if [club for club, _ in self.club_vars] == clubs:
+            return
+
+        selected = {club for club, var in self.club_vars if var.get() == 1}
+        for widget in self.club_frame.winfo_children():
+            widget.destroy()
+        self.club_vars = []
 
         for i, club in enumerate(clubs):
-            var = tk.IntVar()
+            var = tk.IntVar(value=1 if club in selected else 0)
             self.club_vars.append((club, var))
 
             # Math to make it 2 columns
             r = i // 2
             c = i % 2
-            tk.Checkbutton(club_frame, text=club, variable=var, bg="#f0f0f0").grid(row=r, column=c, sticky="w")
+            tk.Checkbutton(self.club_frame, text=club, variable=var, bg="#f0f0f0").grid(row=r, column=c, sticky="w")
 
     def on_show(self):
         """Called whenever the view is shown."""
         self.refresh_events()
-        self.club_filters(self.club_frame)
+        self.club_filters()
 
     def logout(self):
         self.clear_filters()
@@ -137,109 +161,128 @@ class CalendarPage(tk.Frame):
         for _, var in self.club_vars: var.set(0)
         self.use_date_filter.set(0)
         self.show_past_var.set(0)  # Reset past events toggle
+        self.for_you_var.set(0)
+        self.tag_mode_var.set("any")
+        self.search_entry.delete(0, tk.END)
         self.refresh_events()
 
     def refresh_events(self):
         """Fetches data, applies logic (Upcoming vs Past), and redraws."""
+        with self.controller.profiler.measure("CalendarPage", "refresh_events"):
+            self.request_events()
+
+    def request_events(self):
         # Get Filter States
         selected_tags = [tag for tag, var in self.tag_vars if var.get() == 1]
         selected_clubs = [club for club, var in self.club_vars if var.get() == 1]
+        tag_mode = self.tag_mode_var.get()
 
         specific_date_active = (self.use_date_filter.get() == 1)
         filter_date_str = str(self.filter_date_picker.get_date())
 
         show_history = (self.show_past_var.get() == 1)
+        search_text = self.search_entry.get().strip()
+        for_you = (self.for_you_var.get() == 1) and not search_text
 
         # Update Header Text based on mode
-        if show_history:
-            self.header_label.config(text="Past Events (History)")
+        if search_text:
+            self.feed.set_header(f"Search results for \"{search_text}\"")
+        elif for_you:
+            self.feed.set_header("For You")
+        elif show_history:
+            self.feed.set_header("Past Events (History)")
         elif specific_date_active:
-            self.header_label.config(text=f"Events on {filter_date_str}")
+            self.feed.set_header(f"Events on {filter_date_str}")
+        else:
+            self.feed.set_header("Upcoming Events")
+
+        # Filtering happens in SQL
+        if specific_date_active:
+            # If searching for a SPECIFIC date, ignore "Upcoming vs Past" rules
+            filters = dict(tags=selected_tags, clubs=selected_clubs, tag_mode=tag_mode,
+                           date_from=filter_date_str, date_to=filter_date_str)
         else:
-            self.header_label.config(text="Upcoming Events")
-
-        # Get Data
-        all_events = db.get_all_events()
-        today = date.today()
-
-        # Clear UI
-        for widget in self.scrollable_frame.winfo_children():
-            if widget != self.header_label:  # Don't delete the title
-                widget.destroy()
-
-        count = 0
-        for event in all_events:
-
-            # Parse Event Date
-            try:
-                # Format is "2025-11-25 | 6:00 PM..."
-                # Split by | and take the first part
-                event_date_str = event['time'].split('|')[0].strip()
-                event_date = datetime.strptime(event_date_str, "%Y-%m-%d").date()
-            except Exception:
-                # If date is corrupted, skip it
-                continue
-
-            # Date Filtering
-            if specific_date_active:
-                # If searching for a SPECIFIC date, ignore "Upcoming vs Past" rules
-                if event_date_str != filter_date_str:
-                    continue
+            # Normal Mode: Toggle between Upcoming and History
+            filters = dict(tags=selected_tags, clubs=selected_clubs, tag_mode=tag_mode, upcoming=not show_history)
+
+        self.current_filters = filters
+        self.current_ranked = bool(search_text) or for_you
+        worker = self.controller.db_worker
+        profiler = self.controller.profiler
+
+        # Ranked results come back in one go, the feed pages through them in memory
+        def show_results(results):
+            if isinstance(results, Exception):
+                self.feed.set_header("Could not load events")
+                self.feed.load(0, None)
+                return
+            self.feed.load(len(results), lambda offset, limit, callback: callback(results[offset:offset + limit]),
+                           first_page=results[:EventFeed.PAGE_SIZE])
+
+        if search_text:
+            worker.submit(lambda manager: manager.search_events(search_text, **filters, limit=self.SEARCH_LIMIT),
+                          profiler.track("CalendarPage", "search", show_results), key="calendar-feed")
+            return
+
+        if for_you:
+            # Always upcoming events, the date filters don't apply to the ranked feed
+            email = self.controller.current_user_email
+            worker.submit(lambda manager: manager.recommend_events(email, tags=selected_tags, clubs=selected_clubs,
+                                                                   tag_mode=tag_mode, limit=self.FOR_YOU_LIMIT),
+                          profiler.track("CalendarPage", "for_you", show_results), key="calendar-feed")
+            return
+
+        # Count first so the scrollbar is right, the feed then fetches rows page by page.
+        # Both run on the DB worker; a newer refresh supersedes this one.
+
+        def fetch_page(offset, limit, callback):
+            worker.submit(lambda manager: manager.query_events(**filters, limit=limit, offset=offset),
+                          profiler.track("CalendarPage", "feed_page", callback))
+
+        def first_load(manager):
+            return manager.count_events(**filters), manager.query_events(**filters, limit=EventFeed.PAGE_SIZE)
+
+        def show_first_page(result):
+            if isinstance(result, Exception):
+                show_results(result)
+                return
+            self.feed.load(result[0], fetch_page, first_page=result[1])
+
+        worker.submit(first_load, profiler.track("CalendarPage", "first_load", show_first_page),
+                      key="calendar-feed")
+
+    def apply_changes(self, changes):
+        """
+        Applies changes made by other clients (see EventsCalendarApp.poll_changes).
+        Edits to events already in the feed are patched in place; anything that changes
+        which events match the filters, or their order, reloads the feed.
+        """
+        changed_ids = {int(key) for _, table, key, _ in changes if table in ("events", "event_interests")}
+        if not changed_ids:
+            return
+        if self.current_ranked or any(table == "events" and op != "update" for _, table, _, op in changes):
+            # Events were added or deleted, or the ranking of a ranked feed may have changed
+            self.refresh_events()
+            return
+
+        filters = self.current_filters
+
+        def check(manager):
+            return manager.count_events(**filters), manager.query_events(**filters, ids=changed_ids)
+
+        def patch(result):
+            if isinstance(result, Exception):
+                return
+            total, matching = result
+            loaded = {event_id: event for event_id, event in self.feed.loaded_events().items()
+                      if event_id in changed_ids}
+            still_matching = {event['id']: event for event in matching}
+            reordered = any(event_id not in still_matching or still_matching[event_id]['start'] != event['start']
+                            for event_id, event in loaded.items())
+
+            if total != self.feed.total or reordered:
+                self.refresh_events()
             else:
-                # Normal Mode: Toggle between Upcoming and History
-                if show_history:
-                    # If "Show Past" is CHECKED, show ONLY past events
-                    if event_date >= today:
-                        continue
-                else:
-                    # If "Show Past" is UNCHECKED (Default), show ONLY future/today
-                    if event_date < today:
-                        continue
-
-            # Club Filtering
-            if selected_clubs and event['club'] not in selected_clubs:
-                continue
-
-            # Tag Filtering
-            if selected_tags:
-                event_tags_set = set(event['tags'])
-                filter_tags_set = set(selected_tags)
-                if not event_tags_set.intersection(filter_tags_set):
-                    continue
-
-            self.create_event_card(event)
-            count += 1
-
-        if count == 0:
-            tk.Label(self.scrollable_frame, text="No events found matching your filters.",
-                     fg="gray", bg="white").pack(pady=20)
-
-    def create_event_card(self, event):
-        """Draws a visual card for a single event."""
-        card = tk.Frame(self.scrollable_frame, bg="#f9f9f9", bd=1, relief="solid")
-        card.pack(fill="x", padx=20, pady=10)
-
-        # Header: Name and Time
-        header = tk.Frame(card, bg="#e0e0e0")
-        header.pack(fill="x")
-
-        tk.Label(header, text=event['name'], font=("Arial", 12, "bold"), bg="#e0e0e0").pack(side="left", padx=10,
-                                                                                            pady=5)
-        tk.Label(header, text=event['time'], font=("Arial", 10, "italic"), bg="#e0e0e0").pack(side="right", padx=10)
-
-        # Body: Club and Location
-        body = tk.Frame(card, bg="#f9f9f9")
-        body.pack(fill="x", padx=10, pady=5)
-
-        tk.Label(body, text=f"Hosted by: {event['club']}", fg="#003366", bg="#f9f9f9").pack(anchor="w")
-        tk.Label(body, text=f"📍 {event['location']}", fg="#555", bg="#f9f9f9").pack(anchor="w")
-
-        # Description
-        tk.Label(body, text=event['description'], wraplength=400, justify="left", bg="#f9f9f9").pack(anchor="w", pady=5)
-
-        # Tags Footer
-        if event['tags']:
-            tags_str = " | ".join(event['tags'])
-            tk.Label(card, text=f"Tags: {tags_str}", bg="#f9f9f9", fg="blue", font=("Arial", 8)).pack(anchor="w",
-                                                                                                      padx=10,
-                                                                                                      pady=(0, 5))
\ No newline at end of file
+                self.feed.update_rows([still_matching[event_id] for event_id in loaded])
+
+        self.controller.db_worker.submit(check, patch, key="calendar-changes")
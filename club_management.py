@@ -1,6 +1,7 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from database import db
+from club_roster import import_roster
 
 
 class ClubManagement(tk.Frame):
@@ -19,6 +20,19 @@ class ClubManagement(tk.Frame):
         tk.Button(form_container, text="Create New Club", command=lambda: controller.show_frame("ClubCreation"),
                   width=15, bg="#22AA00", fg="white", font=("Arial", 10, "bold")).pack(side="left", padx=10)
 
+        # Roster import, for clubs the user is an admin of
+        roster_frame = tk.Frame(self)
+        roster_frame.pack(anchor="w", padx=20, pady=(10, 0), fill="x")
+        tk.Label(roster_frame, text="Import members into:").pack(side="left")
+
+        self.roster_club_var = tk.StringVar(self)
+        self.roster_club_menu = tk.OptionMenu(roster_frame, self.roster_club_var, "")
+        self.roster_club_menu.pack(side="left", padx=10)
+
+        self.roster_button = tk.Button(roster_frame, text="Import Roster (.csv)...", command=self.import_roster_file,
+                                       width=20)
+        self.roster_button.pack(side="left")
+
         # Tags/Clubs List
         tk.Label(self, text="Select Clubs to join:").pack(anchor='w', padx=20, pady=(10, 0))
 
@@ -88,5 +102,58 @@ class ClubManagement(tk.Frame):
         else:
             messagebox.showerror("Error", "Could not update clubs.")
 
+    def update_roster_menu(self):
+        """Refreshes the roster import dropdown with the clubs the user is an admin of, on the DB worker."""
+        email = self.controller.current_user_email
+        if not email:
+            self.controller.db_worker.cancel("roster-clubs")
+            self.show_roster_menu([])
+            return
+        self.controller.db_worker.submit(lambda manager: manager.get_user_clubs(email, role="admin"),
+                                         self.show_roster_menu, key="roster-clubs")
+
+    def show_roster_menu(self, clubs):
+        if isinstance(clubs, Exception):
+            clubs = []  # Leave the import disabled rather than offer another user's clubs
+
+        menu = self.roster_club_menu["menu"]
+        menu.delete(0, "end")
+
+        if not clubs:
+            self.roster_club_var.set("No Clubs Found")
+            self.roster_club_menu.configure(state="disabled")
+            self.roster_button.configure(state="disabled")
+        else:
+            self.roster_club_var.set(clubs[0])
+            self.roster_club_menu.configure(state="normal")
+            self.roster_button.configure(state="normal")
+            for club in clubs:
+                menu.add_command(label=club, command=tk._setit(self.roster_club_var, club))
+
+    def import_roster_file(self):
+        """Adds the members listed in a CSV roster (email, role columns) to the selected club."""
+        path = filedialog.askopenfilename(title="Import Club Roster",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+
+        email = self.controller.current_user_email
+        club = self.roster_club_var.get()
+
+        # A failed import reaches finish_roster_import as the exception
+        self.roster_button.configure(state="disabled", text="Importing...")
+        self.controller.db_worker.submit(lambda manager: import_roster(path, club, email, manager=manager),
+                                         self.finish_roster_import, key="roster-import")
+
+    def finish_roster_import(self, report):
+        self.roster_button.configure(state="normal", text="Import Roster (.csv)...")
+        if isinstance(report, Exception):
+            messagebox.showerror("Import Failed", str(report))
+        elif report.imported:
+            messagebox.showinfo("Import Finished", report.summary())
+        else:
+            messagebox.showerror("Import Failed", report.summary())
+
     def on_show(self):
-        self.load_and_display_clubs()
\ No newline at end of file
+        self.load_and_display_clubs()
+        self.update_roster_menu()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Bulk import of a club's members from a CSV roster.
+
+The file is read as a stream and applied in batches with DBManager.update_club_members, so
+a roster of thousands of members is a handful of transactions rather than one per member.
+Only admins of the club can import a roster for it.
+
+The CSV needs a header row with an email column and optionally a role column:
+    email, role
+e.g. "jane.doe@utm.ca,admin". role is 'member' or 'admin'; when it's blank (or 'member')
+new members join as members and existing members keep their role, since admins can't be
+demoted by an import. Rows for emails without an account are rejected.
+"""
+import csv
+import time
+
+from database import db
+from event_import import ImportReport
+
+BATCH_SIZE = 5000
+ROLES = ("member", "admin")
+
+
+def import_roster(path, club, admin_email, manager=db, batch_size=BATCH_SIZE):
+    """Adds the members listed in a CSV file to club. Returns an ImportReport."""
+    if not manager.is_club_admin(admin_email, club):
+        raise ValueError(f"You are not an admin of '{club}'")
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        if "email" not in (reader.fieldnames or []):
+            raise ValueError("The roster needs an 'email' column")
+        rows = ((reader.line_num, record) for record in reader)
+        return _load(rows, club, manager, batch_size)
+
+
+def _load(rows, club, manager, batch_size):
+    """Validates (row number, record) pairs and adds the valid ones in batches."""
+    report = ImportReport("members")
+    start = time.perf_counter()
+    batch = []
+
+    for row_number, record in rows:
+        try:
+            batch.append((row_number, *_validate(record)))
+        except ValueError as e:
+            report.errors.append((row_number, str(e)))
+            continue
+
+        if len(batch) >= batch_size:
+            _flush(batch, club, manager, report)
+
+    _flush(batch, club, manager, report)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _flush(batch, club, manager, report):
+    if not batch:
+        return
+    registered = manager.get_registered_emails(email for _, email, _ in batch)
+    members = []
+    member_rows = []
+    for row_number, email, role in batch:
+        if email in registered:
+            members.append((email, role))
+            member_rows.append(row_number)
+        else:
+            report.errors.append((row_number, f"No account with the email '{email}'"))
+
+    if members:
+        if manager.update_club_members(club, members) is True:
+            report.imported += len(members)
+        else:
+            report.errors.extend((row, "Database rejected this batch") for row in member_rows)
+    batch.clear()
+
+
+def _validate(record):
+    """Checks one row and returns it as (email, role). Raises ValueError if it's invalid."""
+    email = (record.get("email") or "").strip()
+    if "@" not in email:
+        raise ValueError("Missing or invalid email")
+
+    role = (record.get("role") or "").strip().lower() or "member"
+    if role not in ROLES:
+        raise ValueError(f"Unknown role '{role}'")
+    # A 'member' row keeps an existing member's role, so an import never demotes an admin
+    return email, (role if role == "admin" else None)
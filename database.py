@@ -1,120 +1,602 @@
+import functools
+import itertools
+import os
+import pathlib
+import re
 import sqlite3
+import threading
 from sqlite3 import Error
-import bcrypt
+from datetime import date, datetime, timedelta
+from constants import INTEREST_TAGS
+
+
+# Storage format of events.start_ts / events.end_ts. ISO strings sort chronologically,
+# so date-window filters can be answered with an index range scan on start_ts.
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def parse_time_frame(time_frame):
+    """
+    Parses a time_frame string like "2025-11-25 | 6:00 PM - 8:00 PM" into
+    (start_ts, end_ts) ISO strings. Returns (None, None) if it can't be parsed.
+    """
+    try:
+        date_part, _, hours_part = (p.strip() for p in time_frame.partition("|"))
+        day = _parse_day(date_part)
+    except (AttributeError, ValueError):
+        return None, None
+
+    start = end = day
+    try:
+        start_str, end_str = (p.strip() for p in hours_part.split("-"))
+        start = day.replace(**_parse_clock(start_str))
+        end = day.replace(**_parse_clock(end_str))
+        if end < start:
+            # Event runs past midnight
+            end += timedelta(days=1)
+    except ValueError:
+        # Only the date is usable, keep the event as an all-day entry
+        pass
+
+    return start.strftime(TIMESTAMP_FORMAT), end.strftime(TIMESTAMP_FORMAT)
+
+
+# The date and "6:00 PM" times written by the event forms are parsed by hand where
+# possible, strptime is slow enough to dominate bulk imports and migrations.
+CLOCK_PATTERN = re.compile(r"(\d{1,2}):(\d{2})\s*([AaPp][Mm])")
+
+
+def _parse_day(text):
+    """Parses "YYYY-MM-DD" into a datetime at midnight."""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        # e.g. "2025-1-5", which the original forms could store
+        return datetime.strptime(text, "%Y-%m-%d")
+
+
+def _parse_clock(text):
+    """Parses a 12-hour time like "6:00 PM" into {"hour": 18, "minute": 0}. Raises ValueError otherwise."""
+    match = CLOCK_PATTERN.fullmatch(text)
+    if not match or not 1 <= int(match.group(1)) <= 12 or int(match.group(2)) > 59:
+        raise ValueError(f"Not a 12-hour time: {text!r}")
+    hour = int(match.group(1)) % 12
+    if match.group(3).upper() == "PM":
+        hour += 12
+    return {"hour": hour, "minute": int(match.group(2))}
+
+
+# Bit i of events.tag_mask / users.interest_mask stands for INTEREST_TAGS[i].
+# Stored masks depend on this order, so new tags must only ever be appended to INTEREST_TAGS.
+TAG_BITS = {tag: 1 << i for i, tag in enumerate(INTEREST_TAGS)}
+
+
+def tag_mask(tags):
+    """Packs a list of interest tags into a bitmask. Tags that aren't in INTEREST_TAGS are ignored."""
+    mask = 0
+    for tag in tags or ():
+        mask |= TAG_BITS.get(tag, 0)
+    return mask
+
+
+def format_time_frame(day, start, end):
+    """
+    Builds the time_frame string stored for an event, the same format the event forms use:
+    format_time_frame(date(2025, 11, 25), time(18, 0), time(20, 0)) -> "2025-11-25 | 6:00 PM - 8:00 PM"
+    """
+    def clock(t):
+        return f"{t.hour % 12 or 12}:{t.minute:02d} {'AM' if t.hour < 12 else 'PM'}"
+
+    return f"{day} | {clock(start)} - {clock(end)}"
+
+
+def _create_base_tables(c):
+    """Migration 1: the original tables for the application (Users and Events)."""
+    sql_create_users_table = """ CREATE TABLE IF NOT EXISTS users (
+                                     id INTEGER PRIMARY KEY,
+                                     name TEXT NOT NULL,
+                                     email TEXT UNIQUE NOT NULL,
+                                     password TEXT NOT NULL
+                                 ); """
+
+    sql_create_events_table = """ CREATE TABLE IF NOT EXISTS events (
+                                      id INTEGER PRIMARY KEY,
+                                      event_name TEXT NOT NULL,
+                                      host_club TEXT,
+                                      description TEXT,
+                                      time_frame TEXT,
+                                      location TEXT,
+                                      FOREIGN KEY (host_club) REFERENCES clubs (club_name) ON DELETE CASCADE ON UPDATE CASCADE
+                                  ); """
+
+    sql_create_event_interests_table = """ CREATE TABLE IF NOT EXISTS event_interests ( 
+                                        event_id INTEGER, 
+                                        interest_tag TEXT  NOT NULL, 
+                                        FOREIGN  KEY (event_id) REFERENCES events (id) ON DELETE CASCADE,
+                                        PRIMARY KEY (event_id,interest_tag)
+                                        ); """
+
+    sql_create_user_interests_table = """ CREATE TABLE IF NOT EXISTS user_interests ( 
+                                        user_email TEXT, 
+                                        interest_tag TEXT  NOT NULL, 
+                                        FOREIGN  KEY (user_email) REFERENCES users (email) ON DELETE CASCADE ON UPDATE CASCADE,
+                                        PRIMARY KEY (user_email,interest_tag)
+                                        ); """
+
+    sql_create_clubs_table = """CREATE TABLE IF NOT EXISTS clubs (
+                                id INTEGER PRIMARY KEY,
+                                club_name TEXT UNIQUE NOT NULL,   
+                                club_email TEXT NOT NULL,   
+                                club_description TEXT                            
+                                );"""
+
+    sql_create_user_clubs_table = """ CREATE TABLE IF NOT EXISTS user_clubs ( 
+                                user_email TEXT, 
+                                club TEXT  NOT NULL, 
+                                role TEXT DEFAULT 'member',
+                                FOREIGN  KEY (user_email) REFERENCES users (email) ON DELETE CASCADE ON UPDATE CASCADE, 
+                                PRIMARY KEY (user_email,club)
+                                ); """ # if User changes their email in the 'users' table,  it automatically updates in clubs too.
+    c.execute(sql_create_clubs_table)
+    c.execute(sql_create_users_table)
+    c.execute(sql_create_events_table)
+    c.execute(sql_create_event_interests_table)
+    c.execute(sql_create_user_interests_table)
+    c.execute(sql_create_user_clubs_table)
+
+
+def _add_event_timestamps(c):
+    """
+    Migration 2: structured start_ts/end_ts columns on events.
+    Fills them in for existing rows by parsing their time_frame strings.
+    """
+    c.execute("PRAGMA table_info(events)")
+    columns = {row[1] for row in c.fetchall()}
+    if "start_ts" not in columns:
+        c.execute("ALTER TABLE events ADD COLUMN start_ts TEXT")
+        c.execute("ALTER TABLE events ADD COLUMN end_ts TEXT")
+
+        c.execute("SELECT id, time_frame FROM events")
+        rows = [(*parse_time_frame(time_frame), event_id) for event_id, time_frame in c.fetchall()]
+        c.executemany("UPDATE events SET start_ts = ?, end_ts = ? WHERE id = ?", rows)
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_events_start_ts ON events (start_ts)")
+
+
+def _add_secondary_indexes(c):
+    """Migration 3: indexes for the lookups that used to scan whole tables."""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_events_host_club_start_ts ON events (host_club, start_ts)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_events_event_name ON events (event_name)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_event_interests_tag ON event_interests (interest_tag)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_user_clubs_club_role ON user_clubs (club, role)")
+
+
+def _add_change_log(c):
+    """
+    Migration 4: a change log filled in by triggers, so clients sharing the database file
+    can ask what changed since the last version they saw instead of re-reading everything.
+    row_key is the event id for events/event_interests, the club name for clubs and the
+    user's email for user_clubs.
+    """
+    c.execute(""" CREATE TABLE IF NOT EXISTS change_log (
+                      version INTEGER PRIMARY KEY AUTOINCREMENT,
+                      table_name TEXT NOT NULL,
+                      row_key TEXT NOT NULL,
+                      op TEXT NOT NULL
+                  ); """)
+
+    tracked = [
+        ("events", "id"),
+        ("event_interests", "event_id"),
+        ("clubs", "club_name"),
+        ("user_clubs", "user_email"),
+    ]
+    for table, key in tracked:
+        for op, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+            c.execute(f""" CREATE TRIGGER IF NOT EXISTS trg_{table}_{op.lower()}_log
+                           AFTER {op} ON {table}
+                           BEGIN
+                               INSERT INTO change_log(table_name, row_key, op)
+                               VALUES ('{table}', {row}.{key}, '{op.lower()}');
+                           END; """)
+
+
+def _add_event_search(c):
+    """
+    Migration 5: an FTS5 index over event name, description, location and host club.
+    It is an external-content table, so the text itself is only stored in events;
+    triggers keep the index in step with every insert, update and delete.
+    """
+    c.execute(""" CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+                      event_name, description, location, host_club,
+                      content='events', content_rowid='id',
+                      tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                  ); """)
+
+    columns = "event_name, description, location, host_club"
+    new_values = "new.event_name, new.description, new.location, new.host_club"
+    old_values = "old.event_name, old.description, old.location, old.host_club"
+    c.execute(f""" CREATE TRIGGER IF NOT EXISTS trg_events_fts_insert AFTER INSERT ON events
+                   BEGIN
+                       INSERT INTO events_fts(rowid, {columns}) VALUES (new.id, {new_values});
+                   END; """)
+    c.execute(f""" CREATE TRIGGER IF NOT EXISTS trg_events_fts_delete AFTER DELETE ON events
+                   BEGIN
+                       INSERT INTO events_fts(events_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                   END; """)
+    c.execute(f""" CREATE TRIGGER IF NOT EXISTS trg_events_fts_update AFTER UPDATE OF {columns} ON events
+                   BEGIN
+                       INSERT INTO events_fts(events_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                       INSERT INTO events_fts(rowid, {columns}) VALUES (new.id, {new_values});
+                   END; """)
+
+    # Index the events that already exist
+    c.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+
+
+def _add_tag_masks(c):
+    """
+    Migration 6: events.tag_mask and users.interest_mask, the event's tags and the user's
+    interests packed into an integer (see TAG_BITS), so tag filters and interest matching
+    are bitwise operations on the row instead of lookups in event_interests/user_interests.
+    The DBManager methods that write tags or interests keep them up to date.
+    """
+    c.execute("PRAGMA table_info(events)")
+    if "tag_mask" not in {row[1] for row in c.fetchall()}:
+        c.execute("ALTER TABLE events ADD COLUMN tag_mask INTEGER NOT NULL DEFAULT 0")
+    c.execute("PRAGMA table_info(users)")
+    if "interest_mask" not in {row[1] for row in c.fetchall()}:
+        c.execute("ALTER TABLE users ADD COLUMN interest_mask INTEGER NOT NULL DEFAULT 0")
+
+    # Backfill from the tag tables. Tags are unique per row (primary key), so summing bits is an OR
+    bit_case = "CASE interest_tag " + " ".join("WHEN ? THEN ?" for _ in TAG_BITS) + " ELSE 0 END"
+    bit_params = [value for item in TAG_BITS.items() for value in item]
+    c.execute(f""" UPDATE events SET tag_mask = (SELECT coalesce(sum({bit_case}), 0)
+                                                FROM event_interests WHERE event_id = events.id) """,
+              bit_params)
+    c.execute(f""" UPDATE users SET interest_mask = (SELECT coalesce(sum({bit_case}), 0)
+                                                    FROM user_interests WHERE user_email = users.email) """,
+              bit_params)
+
+
+# Ordered schema migrations. A database at PRAGMA user_version N has had the first N applied.
+# Only ever append to this list; never edit or reorder a migration that has shipped.
+MIGRATIONS = [
+    _create_base_tables,
+    _add_event_timestamps,
+    _add_secondary_indexes,
+    _add_change_log,
+    _add_event_search,
+    _add_tag_masks,
+]
+
+
+def _freeze(value):
+    """Turns list arguments into tuples so a call can be used as a cache key."""
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def cached_read(method):
+    """
+    Serves repeated calls of an event read from DBManager's cache. Entries are only
+    valid for the cache generation they were read in, see invalidates_cache, and for the
+    day they were read on: upcoming=True/False filters are relative to date.today().
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, date.today(), _freeze(args), _freeze(kwargs))
+        with self._cache_lock:
+            generation = self.cache_generation
+            entry = self._cache.get(key)
+            if entry is not None:
+                self.cache_hits += 1
+                return entry
+            self.cache_misses += 1
+
+        result = method(self, *args, **kwargs)
+
+        with self._cache_lock:
+            # Don't store a result if a write finished while it was being read
+            if self.cache_generation == generation:
+                if len(self._cache) >= self.CACHE_SIZE:
+                    # Evict the oldest entry
+                    del self._cache[next(iter(self._cache))]
+                self._cache[key] = result
+        return result
+
+    return wrapper
+
+
+def invalidates_cache(method):
+    """Marks a write that can change cached event reads: it bumps the cache generation when done."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.invalidate_cache()
+
+    return wrapper
 
 
 class DBManager:
-    def __init__(self, db_file="events.db"):
-        self.conn = None
+    """
+    Access to the events database. Every thread gets its own SQLite connection (opened on
+    first use through the conn property), so the Tk thread and background workers can use
+    the same DBManager. In WAL mode readers don't block the writer, and busy_timeout makes
+    a writer wait for a lock held by another connection or process instead of failing
+    with "database is locked".
+
+    db_file may be ":memory:": a private in-memory database for this DBManager. Its threads
+    still get a connection each (to a named memdb database), so transactions stay separate.
+    With read_only=True the file is opened with a mode=ro URI: nothing is created or migrated,
+    and every write fails (and returns False/None like any other database error).
+
+    Event reads go through an in-process cache that is dropped whenever a write that can
+    change them (events, club deletions, memberships) bumps cache_generation. Cached
+    results are shared between callers, so treat them as read-only.
+    """
+    CACHE_SIZE = 256  # Entries, e.g. one per feed page for the current filters
+    CHANGE_LOG_KEEP = 50_000  # Newest change_log entries kept by prune_change_log
+    SEARCH_RANK_ALL = 10_000  # Up to this many matches, search_events ranks them all
+    SEARCH_CANDIDATES = 1000  # Past that, the newest matches it ranks
+    connection_factory = sqlite3.Connection  # Replaced by db_trace to time every statement
+    _memory_names = itertools.count(1)
+
+    def __init__(self, db_file="events.db", journal_mode="wal", busy_timeout=5000, synchronous="normal",
+                 read_only=False):
+        self.db_file = db_file
+        self.read_only = read_only
+        self.journal_mode = journal_mode
+        self.busy_timeout = busy_timeout  # milliseconds
+        self.synchronous = synchronous
+
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        # Each connection to ":memory:" is a separate database, so threads connect to a named
+        # in-memory database instead. It lives as long as one connection to it is open, which
+        # _memory_keeper makes sure of.
+        self._memory_uri = None
+        self._memory_keeper = None
+        if db_file == ":memory:":
+            self._memory_uri = f"file:/events-memory-{os.getpid()}-{next(self._memory_names)}?vfs=memdb"
+            self._memory_keeper = self._connect(check_same_thread=False)
+
+        self._cache = {}  # (method, args, kwargs) -> result
+        self._cache_lock = threading.Lock()
+        self.cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
         try:
-            self.conn = sqlite3.connect(db_file)
-            # Enable Foreign Keys enforcement for ON UPDATE CASCADE to work.
-            self.conn.execute("PRAGMA foreign_keys = 1")
-            self.create_tables()
+            if read_only:
+                self.check_schema()
+            else:
+                self.create_tables()
             print(f"Database connection successful: {db_file}")
         except Error as e:
             print(e)
 
-    def create_tables(self):
-        """Creates the necessary tables for the application (Users and Events)."""
-        sql_create_users_table = """ CREATE TABLE IF NOT EXISTS users (
-                                         id INTEGER PRIMARY KEY,
-                                         name TEXT NOT NULL,
-                                         email TEXT UNIQUE NOT NULL,
-                                         password TEXT NOT NULL
-                                     ); """
-
-        sql_create_events_table = """ CREATE TABLE IF NOT EXISTS events (
-                                          id INTEGER PRIMARY KEY,
-                                          event_name TEXT NOT NULL,
-                                          host_club TEXT,
-                                          description TEXT,
-                                          time_frame TEXT,
-                                          location TEXT,
-                                          FOREIGN KEY (host_club) REFERENCES clubs (club_name) ON DELETE CASCADE ON UPDATE CASCADE
-                                      ); """
-
-        sql_create_event_interests_table = """ CREATE TABLE IF NOT EXISTS event_interests ( 
-                                            event_id INTEGER, 
-                                            interest_tag TEXT  NOT NULL, 
-                                            FOREIGN  KEY (event_id) REFERENCES events (id) ON DELETE CASCADE,
-                                            PRIMARY KEY (event_id,interest_tag)
-                                            ); """
-
-        sql_create_user_interests_table = """ CREATE TABLE IF NOT EXISTS user_interests ( 
-                                            user_email TEXT, 
-                                            interest_tag TEXT  NOT NULL, 
-                                            FOREIGN  KEY (user_email) REFERENCES users (email) ON DELETE CASCADE ON UPDATE CASCADE,
-                                            PRIMARY KEY (user_email,interest_tag)
-                                            ); """
-
-        sql_create_clubs_table = """CREATE TABLE IF NOT EXISTS clubs (
-                                    id INTEGER PRIMARY KEY,
-                                    club_name TEXT UNIQUE NOT NULL,   
-                                    club_email TEXT NOT NULL,   
-                                    club_description TEXT                            
-                                    );"""
-
-        sql_create_user_clubs_table = """ CREATE TABLE IF NOT EXISTS user_clubs ( 
-                                    user_email TEXT, 
-                                    club TEXT  NOT NULL, 
-                                    role TEXT DEFAULT 'member',
-                                    FOREIGN  KEY (user_email) REFERENCES users (email) ON DELETE CASCADE ON UPDATE CASCADE, 
-                                    PRIMARY KEY (user_email,club)
-                                    ); """ # if User changes their email in the 'users' table,  it automatically updates in clubs too.
+    @property
+    def conn(self):
+        """The calling thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _connect(self, check_same_thread=True):
+        if self._memory_uri:
+            conn = sqlite3.connect(self._memory_uri, uri=True, timeout=self.busy_timeout / 1000,
+                                   check_same_thread=check_same_thread, factory=self.connection_factory)
+        elif self.read_only:
+            uri = pathlib.Path(self.db_file).absolute().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout / 1000,
+                                   check_same_thread=check_same_thread, factory=self.connection_factory)
+        else:
+            conn = sqlite3.connect(self.db_file, timeout=self.busy_timeout / 1000,
+                                   check_same_thread=check_same_thread, factory=self.connection_factory)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        if self.journal_mode and not self.read_only:
+            # The journal mode is stored in the database file, so this is a no-op after the first time
+            # (and can't be changed through a read-only connection)
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous:
+            # NORMAL is safe in WAL mode and avoids an fsync on every commit
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        # Enable Foreign Keys enforcement for ON UPDATE CASCADE to work.
+        conn.execute("PRAGMA foreign_keys = 1")
+
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Closes the calling thread's connection. Another one is opened if this thread uses conn again."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._connections_lock:
+                self._connections.remove(conn)
+            conn.close()
+
+    def invalidate_cache(self):
+        """Drops every cached event read. Called after each write that can change them."""
+        with self._cache_lock:
+            self.cache_generation += 1
+            self._cache.clear()
+
+    def cache_stats(self):
+        """Returns the event cache's hit/miss counters."""
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "generation": self.cache_generation,
+                "entries": len(self._cache),
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": self.cache_hits / lookups if lookups else 0.0
+            }
+
+    def data_version(self):
+        """
+        PRAGMA data_version of the calling thread's connection. It changes whenever another
+        connection (in this or another process) commits, and costs no table access.
+        """
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_change_version(self):
+        """Returns the newest change_log version, 0 if nothing has been logged."""
         try:
             c = self.conn.cursor()
-            c.execute(sql_create_clubs_table)
-            c.execute(sql_create_users_table)
-            c.execute(sql_create_events_table)
-            c.execute(sql_create_event_interests_table)
-            c.execute(sql_create_user_interests_table)
-            c.execute(sql_create_user_clubs_table)
+            # From sqlite_sequence, so it is still right when pruning emptied the table
+            c.execute("SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'change_log'), 0)")
+            return c.fetchone()[0]
+        except Error as e:
+            print(e)
+            return 0
+
+    def get_changes_since(self, version):
+        """
+        Returns the changes logged after version as (version, table_name, row_key, op) tuples.
+        If some of them were already pruned, a single (newest version, "change_log", "", "reset")
+        tuple is returned instead: the caller has to reload everything.
+        """
+        sql = "SELECT version, table_name, row_key, op FROM change_log WHERE version > ? ORDER BY version"
+        try:
+            c = self.conn.cursor()
+            c.execute("SELECT MIN(version) FROM change_log")
+            oldest = c.fetchone()[0]
+            if oldest is not None and oldest > version + 1:
+                return [(self.get_change_version(), "change_log", "", "reset")]
+            c.execute(sql, (version,))
+            return c.fetchall()
+        except Error as e:
+            print(e)
+            return []
+
+    def poll_changes(self, version, data_version=None):
+        """
+        Cheap check for changes committed by other connections since version.
+        Returns (newest version, list of changes, data_version). change_log is only read when
+        this thread's data_version moved from the one the previous poll returned. Nothing is
+        remembered here: the caller keeps both versions once it has applied the changes, so
+        a poll whose result never arrives is simply repeated. When there are changes the
+        event cache is invalidated.
+        """
+        current = self.data_version()
+        if current == data_version:
+            return version, [], current
+
+        changes = self.get_changes_since(version)
+        if not changes:
+            return version, [], current
+
+        self.invalidate_cache()
+        return changes[-1][0], changes, current
+
+    def prune_change_log(self, keep=None):
+        """
+        Deletes all but the newest keep (default CHANGE_LOG_KEEP) change_log entries.
+        A client that falls further behind than that gets a "reset" from get_changes_since.
+        """
+        if self.read_only:
+            return False
+        keep = self.CHANGE_LOG_KEEP if keep is None else keep
+        try:
+            c = self.conn.cursor()
+            c.execute("DELETE FROM change_log WHERE version <= (SELECT MAX(version) FROM change_log) - ?", (keep,))
             self.conn.commit()
+            return True
+        except Error as e:
+            print(e)
+            self.conn.rollback()
+            return False
+
+    def create_tables(self):
+        """
+        Creates the necessary tables for the application, or upgrades an existing database.
+        The schema version is kept in PRAGMA user_version, so a database that is already
+        current costs a single PRAGMA read and no DDL at startup.
+        """
+        try:
+            c = self.conn.cursor()
+            c.execute("PRAGMA user_version")
+            version = c.fetchone()[0]
+            if version >= len(MIGRATIONS):
+                return
+
+            # Apply each pending migration in its own transaction together with its version bump
+            for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                c.execute("BEGIN")
+                migration(c)
+                c.execute(f"PRAGMA user_version = {number}")
+                self.conn.commit()
         except Error as e:
             print(e)
+            self.conn.rollback()
+
+    def check_schema(self):
+        """For read-only use: warns if the database hasn't had every migration applied."""
+        c = self.conn.cursor()
+        c.execute("PRAGMA user_version")
+        version = c.fetchone()[0]
+        if version < len(MIGRATIONS):
+            print(f"Database {self.db_file} is at schema version {version} of {len(MIGRATIONS)}; "
+                  f"open it once without read_only to upgrade it")
 
     def register_user(self, name, email, password, interests):
         """Inserts a new user into the database."""
-        sql_user = ''' INSERT INTO users(name, email, password) VALUES (?, ?, ?) '''
+        sql_user = ''' INSERT INTO users(name, email, password, interest_mask) VALUES (?, ?, ?, ?) '''
         try:
             c = self.conn.cursor()
-            c.execute(sql_user, (name, email, password))
+            c.execute(sql_user, (name, email, password, tag_mask(interests)))
 
             # insert interests
-            sql_interest = ''' INSERT INTO user_interests(user_email, interest_tag) VALUES (?, ?) '''
-            for tags in interests:
-                c.execute(sql_interest, (email, tags))
+            self._sync_tags(c, "user_interests", "user_email", email, interests)
 
             self.conn.commit()
             return True
         except sqlite3.IntegrityError:
             # This handles the case where the email already exists (UNIQUE constraint)
+            self.conn.rollback()
             return False
         except Error as e:
             print(e)
+            self.conn.rollback()
             return False
 
-    def check_credentials(self, email, password):
-        """Checks if the email and password combination is valid using bcrypt."""
-        sql = ''' SELECT name, password FROM users WHERE email = ? '''
+    def get_password_hash(self, email):
+        """Returns the stored bcrypt hash of the user's password, or None if there is no such user."""
+        sql = ''' SELECT password FROM users WHERE email = ? '''
         try:
             c = self.conn.cursor()
             c.execute(sql, (email,))
             row = c.fetchone()
-            if not row:
-                return None
-
-            name, stored_hash = row[0], row[1]
-
-            # Compare provided password with the stored bcrypt hash
-            if bcrypt.checkpw(password.encode('utf-8'), stored_hash):
-                return name
-            return None
+            return row[0] if row else None
         except Error as e:
             print(e)
             return None
 
+    def update_password_hash(self, email, password_hash):
+        """Replaces the stored password hash, e.g. after rehashing it at a new bcrypt cost."""
+        sql = ''' UPDATE users SET password = ? WHERE email = ? '''
+        try:
+            c = self.conn.cursor()
+            c.execute(sql, (password_hash, email))
+            self.conn.commit()
+            return True
+        except Error as e:
+            print(e)
+            self.conn.rollback()
+            return False
+
     def get_user_by_email(self, email):
         """Fetches the user's name, email, and interests from the database."""
         sql_user = ''' SELECT name, email FROM users WHERE email = ? '''
@@ -135,27 +617,22 @@ class DBManager:
             print(e)
             return None
 
+    @invalidates_cache
     def update_user_profile(self, old_email, new_name, new_email, new_interests_list):
         """Updates the user's profile details and associated interests."""
 
         sql_update_user = ''' UPDATE users SET name  = ?,
-                                               email = ? WHERE email = ? '''
-
-        sql_delete_interests = ''' DELETE  FROM user_interests WHERE user_email = ? '''
-        sql_insert_interest = ''' INSERT INTO user_interests(user_email, interest_tag) VALUES (?, ?) '''
+                                               email = ?,
+                                               interest_mask = ? WHERE email = ? '''
 
         try:
             c = self.conn.cursor()
 
             # Update basic user data (Name and Email)
-            c.execute(sql_update_user, (new_name, new_email, old_email))
-
-            # Delete all old interests for the user
-            c.execute(sql_delete_interests, (new_email,))  # Use new_email if changed, else old
+            c.execute(sql_update_user, (new_name, new_email, tag_mask(new_interests_list), old_email))
 
-            # Insert the new set of interests
-            for tag in new_interests_list:
-                c.execute(sql_insert_interest, (new_email, tag))
+            # Only write the interests that changed (the email change has cascaded to user_interests)
+            self._sync_tags(c, "user_interests", "user_email", new_email, new_interests_list)
 
             self.conn.commit()
             return True
@@ -165,8 +642,10 @@ class DBManager:
             return "EmailExists"
         except Error as e:
             print(e)
+            self.conn.rollback()
             return False
 
+    @invalidates_cache
     def delete_user_account(self, email):
         """
         Deletes a user account.
@@ -174,45 +653,53 @@ class DBManager:
         1. If user is the LAST Admin -> Delete Club.
         2. If user is NOT the last Admin but is the Contact Person -> Transfer Contact to another Admin.
         """
-        sql_delete_user = "DELETE FROM users WHERE email = ?"
+        # Clubs the user is the only admin of
+        sql_delete_clubs = """ WITH admin_clubs AS (
+                                   SELECT club FROM user_clubs WHERE user_email = :email AND role = 'admin'
+                               ),
+                               last_admin AS (
+                                   SELECT club FROM admin_clubs a
+                                   WHERE NOT EXISTS (SELECT 1 FROM user_clubs o
+                                                     WHERE o.club = a.club AND o.role = 'admin'
+                                                       AND o.user_email != :email)
+                               )
+                               DELETE FROM clubs WHERE club_name IN last_admin """
+        # Clubs the user is the contact of but not the only admin of: hand the contact to another admin
+        sql_transfer_contact = """ WITH admin_clubs AS (
+                                       SELECT club FROM user_clubs WHERE user_email = :email AND role = 'admin'
+                                   ),
+                                   transfer_contact AS (
+                                       SELECT club FROM admin_clubs a
+                                       WHERE EXISTS (SELECT 1 FROM user_clubs o
+                                                     WHERE o.club = a.club AND o.role = 'admin'
+                                                       AND o.user_email != :email)
+                                   )
+                                   UPDATE clubs
+                                   SET club_email = (SELECT MIN(o.user_email) FROM user_clubs o
+                                                     WHERE o.club = clubs.club_name AND o.role = 'admin'
+                                                       AND o.user_email != :email)
+                                   WHERE club_email = :email AND club_name IN transfer_contact """
+        sql_delete_user = "DELETE FROM users WHERE email = :email"
 
         try:
             c = self.conn.cursor()
+            # One write transaction with a fixed number of statements, however many clubs the user runs
+            c.execute("BEGIN IMMEDIATE")
+            params = {"email": email}
 
-            # Find clubs where this user is an 'admin'
-            c.execute("SELECT club FROM user_clubs WHERE user_email = ? AND role = 'admin'", (email,))
-            admin_clubs = [row[0] for row in c.fetchall()]
-
-            for club_name in admin_clubs:
-                # Count total admins
-                c.execute("SELECT count(*) FROM user_clubs WHERE club = ? AND role = 'admin'", (club_name,))
-                admin_count = c.fetchone()[0]
-
-                if admin_count == 1:
-                    # Case A: User is the LAST/ONLY Admin.
-                    # Delete the entire club (cascades to events).
-                    print(f"User is last admin of {club_name}. Deleting club.")
-                    c.execute("DELETE FROM clubs WHERE club_name = ?", (club_name,))
-
-                else:
-                    # Case B: There are other admins remaining.
-                    # Check if the deleting user is the registered 'club_email'
-                    c.execute("SELECT club_email FROM clubs WHERE club_name = ?", (club_name,))
-                    current_club_email = c.fetchone()[0]
-
-                    if current_club_email == email:
-                        # The contact person is leaving so transfer this responsibility
-                        # Find another admin
-                        c.execute(
-                            "SELECT user_email FROM user_clubs WHERE club = ? AND role = 'admin' AND user_email != ?",
-                            (club_name, email))
-                        new_admin_email = c.fetchone()[0]
-
-                        print(f"Transferring ownership of {club_name} to {new_admin_email}")
-                        c.execute("UPDATE clubs SET club_email = ? WHERE club_name = ?", (new_admin_email, club_name))
+            # changes() rather than rowcount, which sqlite3 doesn't report for statements starting with WITH
+            c.execute(sql_delete_clubs, params)
+            deleted = c.execute("SELECT changes()").fetchone()[0]
+            if deleted:
+                print(f"User was last admin of {deleted} club(s). Deleting them.")
+
+            c.execute(sql_transfer_contact, params)
+            transferred = c.execute("SELECT changes()").fetchone()[0]
+            if transferred:
+                print(f"Transferring ownership of {transferred} club(s) to another admin.")
 
             # Finally delete the user account
-            c.execute(sql_delete_user, (email,))
+            c.execute(sql_delete_user, params)
 
             self.conn.commit()
             return True
@@ -221,27 +708,65 @@ class DBManager:
             self.conn.rollback()
             return False
 
+    @invalidates_cache
     def create_event(self, name, club, description, time, location, tags_list):
         """Inserts a new event listing into the database."""
         sql = ''' INSERT INTO events(event_name, host_club, description, time_frame, 
-                                     location)
-                  VALUES(?,?,?,?,?) '''
+                                     location, start_ts, end_ts, tag_mask)
+                  VALUES(?,?,?,?,?,?,?,?) '''
 
-        sql_tag = '''INSERT INTO event_interests(event_id, interest_tag) VALUES(?, ?) '''
         try:
             c = self.conn.cursor()
-            c.execute(sql, (name, club, description, time, location))
+            start_ts, end_ts = parse_time_frame(time)
+            c.execute(sql, (name, club, description, time, location, start_ts, end_ts, tag_mask(tags_list)))
 
             new_event_id = c.lastrowid
-            for tag in tags_list:
-                c.execute(sql_tag, (new_event_id, tag))
+            self._sync_tags(c, "event_interests", "event_id", new_event_id, tags_list)
 
             self.conn.commit()
             return True
         except Error as e:
             print(f"Error creating event: {e}")
+            self.conn.rollback()
+            return False
+
+    @invalidates_cache
+    def bulk_create_events(self, events):
+        """
+        Inserts many events in a single transaction, stored the same way as create_event.
+        events is a list of (name, club, description, time, location, tags_list) tuples.
+        Returns True if all of them were inserted, False (and inserts none) otherwise.
+        """
+        sql = ''' INSERT INTO events(id, event_name, host_club, description, time_frame,
+                                     location, start_ts, end_ts, tag_mask)
+                  VALUES(?,?,?,?,?,?,?,?,?) '''
+        sql_tag = '''INSERT INTO event_interests(event_id, interest_tag) VALUES(?, ?) '''
+
+        try:
+            c = self.conn.cursor()
+            # Take the write lock up front so the ids handed out below can't be taken by another writer
+            c.execute("BEGIN IMMEDIATE")
+            c.execute("SELECT COALESCE(MAX(id), 0) FROM events")
+            next_id = c.fetchone()[0] + 1
+
+            event_rows = []
+            tag_rows = []
+            for event_id, (name, club, description, time, location, tags_list) in enumerate(events, start=next_id):
+                event_rows.append((event_id, name, club, description, time, location, *parse_time_frame(time),
+                                   tag_mask(tags_list)))
+                tag_rows.extend((event_id, tag) for tag in tags_list)
+
+            c.executemany(sql, event_rows)
+            c.executemany(sql_tag, tag_rows)
+
+            self.conn.commit()
+            return True
+        except Error as e:
+            print(f"Error creating events: {e}")
+            self.conn.rollback()
             return False
 
+    @invalidates_cache
     def create_club(self, name, email, description, creator_email):
         sql_club = ''' INSERT INTO clubs(club_name, club_email, club_description) \
                        VALUES (?, ?, ?) '''
@@ -272,41 +797,324 @@ class DBManager:
         Retrieves all events and their associated tags from the database.
         Returns a list of dictionaries.
         """
-        sql_events = "SELECT * FROM events ORDER BY time_frame"
-        sql_tags = "SELECT interest_tag FROM event_interests WHERE event_id = ?"
+        return self.query_events()
+
+    @cached_read
+    def query_events(self, tags=None, clubs=None, date_from=None, date_to=None, upcoming=None, ids=None,
+                     tag_mode="any", limit=None, offset=0):
+        """
+        Retrieves the events matching the given filters, ordered by start time.
+        Returns a list of dictionaries in the same shape as get_all_events.
+
+        tags:      only events with any of these tags, or all of them if tag_mode is "all"
+        clubs:     only events hosted by one of these clubs
+        date_from: only events starting on or after this day (date or "YYYY-MM-DD")
+        date_to:   only events starting on or before this day (date or "YYYY-MM-DD")
+        upcoming:  True for events from today onwards, False for past events, None for both
+        ids:       only events with these ids
+        """
+        where_sql, params = self._build_event_filters(tags, clubs, date_from, date_to, upcoming, ids, tag_mode)
+
+        # Tags are aggregated per event inside the same query, using the event_interests primary key
+        sql_events = f''' SELECT e.id, e.event_name, e.host_club, e.description, e.time_frame, e.location,
+                                  e.start_ts, e.end_ts,
+                                  (SELECT group_concat(interest_tag, char(31))
+                                   FROM event_interests WHERE event_id = e.id) AS tags
+                           FROM events e {where_sql}
+                           ORDER BY e.start_ts, e.id '''
+        if limit is not None:
+            sql_events += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
 
-        events_list = []
         try:
             c = self.conn.cursor()
-            c.execute(sql_events)
-            rows = c.fetchall()
+            c.execute(sql_events, params)
+            return [self._row_to_event(row) for row in c.fetchall()]
+        except Error as e:
+            print(e)
+            return []
 
-            # Convert raw tuple rows into a list of dictionaries
-            for row in rows:
-                event_id = row[0]
+    def iter_events(self, tags=None, clubs=None, date_from=None, date_to=None, upcoming=None, ids=None,
+                    tag_mode="any", chunk_size=500):
+        """
+        Yields the events matching the same filters as query_events, in the same order and shape,
+        fetching chunk_size rows at a time so large result sets are never held in memory.
+        Not cached. The generator must be consumed on the thread that created it.
+        """
+        where_sql, params = self._build_event_filters(tags, clubs, date_from, date_to, upcoming, ids, tag_mode)
 
-                # Fetch tags for this specific event
-                c_tag = self.conn.cursor()
-                c_tag.execute(sql_tags, (event_id,))
-                tags = [t[0] for t in c_tag.fetchall()]
+        sql_events = f''' SELECT e.id, e.event_name, e.host_club, e.description, e.time_frame, e.location,
+                                  e.start_ts, e.end_ts,
+                                  (SELECT group_concat(interest_tag, char(31))
+                                   FROM event_interests WHERE event_id = e.id) AS tags
+                           FROM events e {where_sql}
+                           ORDER BY e.start_ts, e.id '''
 
-                event_dict = {
-                    "id": row[0],
-                    "name": row[1],
-                    "club": row[2],
-                    "description": row[3],
-                    "time": row[4],
-                    "location": row[5],
-                    "tags": tags  # Add the list of tags to the dictionary
-                }
-                events_list.append(event_dict)
+        c = self.conn.cursor()
+        try:
+            c.execute(sql_events, params)
+            while True:
+                rows = c.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_event(row)
+        except Error as e:
+            print(e)
+        finally:
+            c.close()
 
-            return events_list
+    @cached_read
+    def count_events(self, tags=None, clubs=None, date_from=None, date_to=None, upcoming=None, ids=None,
+                     tag_mode="any"):
+        """Counts the events matching the same filters as query_events."""
+        where_sql, params = self._build_event_filters(tags, clubs, date_from, date_to, upcoming, ids, tag_mode)
+        sql_count = f"SELECT count(*) FROM events e {where_sql}"
 
+        try:
+            c = self.conn.cursor()
+            c.execute(sql_count, params)
+            return c.fetchone()[0]
+        except Error as e:
+            print(e)
+            return 0
+
+    @cached_read
+    def search_events(self, query, tags=None, clubs=None, date_from=None, date_to=None, upcoming=None,
+                      tag_mode="any", limit=50):
+        """
+        Full-text search over event name, description, location and host club, best matches first.
+        Every word in query must match as a word, the last one may also be the start of a word.
+        Takes the same filters as query_events and returns the same dictionaries.
+
+        When at most SEARCH_RANK_ALL events can pass both the search and the filters, every
+        match is ranked. Scoring all matches of a word like "room", which most events contain,
+        is what made broad searches slow, so past that only the newest SEARCH_CANDIDATES
+        matches are ranked, together with the newest limit older matches in the event name:
+        an event is still found by its name however many other events mention the same words.
+        """
+        match = self._fts_query(query)
+        if not match:
+            return []
+
+        where_sql, where_params = self._build_event_filters(tags, clubs, date_from, date_to, upcoming,
+                                                            tag_mode=tag_mode, conditions=["events_fts MATCH ?"],
+                                                            params=[match])
+        # Only club and date filters are counted, tag filters have no index and need a table scan
+        filter_sql, filter_params = self._build_event_filters(None, clubs, date_from, date_to, upcoming)
+        try:
+            c = self.conn.cursor()
+            # Both counts stop at SEARCH_RANK_ALL + 1 rows, the smaller one bounds the matches
+            c.execute("SELECT count(*) FROM (SELECT 1 FROM events_fts WHERE events_fts MATCH ? LIMIT ?)",
+                      (match, self.SEARCH_RANK_ALL + 1))
+            matches = c.fetchone()[0]
+            if filter_sql and matches > self.SEARCH_RANK_ALL:
+                c.execute(f"SELECT count(*) FROM (SELECT 1 FROM events e {filter_sql} LIMIT ?)",
+                          filter_params + [self.SEARCH_RANK_ALL + 1])
+                matches = c.fetchone()[0]
         except Error as e:
             print(e)
             return []
 
+        # Column weights: a hit in the name counts most, then the club, location and description.
+        # Only the rows that are returned are read in full and get their tags
+        sql_search = f''' SELECT e.id, e.event_name, e.host_club, e.description, e.time_frame, e.location,
+                                 e.start_ts, e.end_ts,
+                                 (SELECT group_concat(interest_tag, char(31))
+                                  FROM event_interests WHERE event_id = e.id) AS tags
+                          FROM (SELECT e.id, e.start_ts, bm25(events_fts, 10.0, 1.0, 2.0, 4.0) AS score
+                                FROM events_fts
+                                JOIN events e ON e.id = events_fts.rowid
+                                {where_sql} {{candidates}}
+                                ORDER BY score, e.start_ts
+                                LIMIT ?) r
+                          JOIN events e ON e.id = r.id
+                          ORDER BY r.score, r.start_ts '''
+        if matches <= self.SEARCH_RANK_ALL:
+            sql_search = sql_search.format(candidates="")
+            params = where_params + [limit]
+        else:
+            names_sql, names_params = self._build_event_filters(
+                tags, clubs, date_from, date_to, upcoming, tag_mode=tag_mode,
+                conditions=["events_fts MATCH ?", "events_fts.rowid < (SELECT min(id) FROM newest)"],
+                params=[f"{{event_name}} : ({match})"])
+            # Both candidate lists walk the index newest first and stop once they are full (CROSS
+            # JOIN keeps events_fts as the outer loop). They are materialized and tested with a
+            # unary + so SQLite can't turn the IN into one full-text lookup per candidate, and
+            # the rowid bound lets the scoring scan skip the matches older than every candidate
+            sql_search = f''' WITH newest(id) AS MATERIALIZED (SELECT e.id FROM events_fts
+                                                               CROSS JOIN events e ON e.id = events_fts.rowid
+                                                               {where_sql}
+                                                               ORDER BY events_fts.rowid DESC
+                                                               LIMIT ?),
+                                   names(id) AS MATERIALIZED (SELECT e.id FROM events_fts
+                                                              CROSS JOIN events e ON e.id = events_fts.rowid
+                                                              {names_sql}
+                                                              ORDER BY events_fts.rowid DESC
+                                                              LIMIT ?),
+                                   candidates(id) AS MATERIALIZED (SELECT id FROM newest
+                                                                   UNION ALL
+                                                                   SELECT id FROM names) ''' + \
+                sql_search.format(candidates="AND events_fts.rowid >= (SELECT min(id) FROM candidates) "
+                                             "AND +events_fts.rowid IN candidates")
+            params = where_params + [self.SEARCH_CANDIDATES] + names_params + [limit] + where_params + [limit]
+
+        try:
+            c.execute(sql_search, params)
+            return [self._row_to_event(row) for row in c.fetchall()]
+        except Error as e:
+            print(e)
+            return []
+
+    # "For You" score weights: per tag shared with the user's interests, for an event hosted by
+    # one of the user's clubs, and for how soon the event starts (full weight now, half in a week)
+    RECOMMEND_TAG_WEIGHT = 3.0
+    RECOMMEND_CLUB_WEIGHT = 5.0
+    RECOMMEND_SOON_WEIGHT = 2.0
+
+    def recommend_events(self, email, tags=None, clubs=None, tag_mode="any", limit=50, now=None):
+        """
+        Ranks upcoming events for a user by how many tags they share with the user's interests,
+        whether one of the user's clubs hosts them and how soon they start. Returns the top
+        limit events, best first, as the same dictionaries as query_events.
+
+        The score is computed in SQL and only the top rows are kept (ORDER BY ... LIMIT uses a
+        bounded sorter), so nothing close to the whole events table reaches Python.
+        Not cached, the proximity part of the score changes as time passes.
+        """
+        now = (now or datetime.now()).strftime(TIMESTAMP_FORMAT)
+        try:
+            c = self.conn.cursor()
+            c.execute("SELECT interest_mask FROM users WHERE email = ?", (email,))
+            row = c.fetchone()
+        except Error as e:
+            print(e)
+            return []
+        interest_bits = [bit for bit in TAG_BITS.values() if row and row[0] & bit]
+        user_clubs = self.get_user_clubs(email)
+
+        where_sql, where_params = self._build_event_filters(tags, clubs, None, None, True, tag_mode=tag_mode)
+        # Shared tags are counted by testing each of the user's interest bits against the event's tag_mask
+        shared_tags_sql = " + ".join("(e.tag_mask & ? != 0)" for _ in interest_bits) or "0"
+        club_placeholders = ",".join("?" for _ in user_clubs)
+
+        sql_recommend = f''' SELECT e.id, e.event_name, e.host_club, e.description, e.time_frame, e.location,
+                                     e.start_ts, e.end_ts,
+                                     (SELECT group_concat(interest_tag, char(31))
+                                      FROM event_interests WHERE event_id = e.id) AS tags,
+                                     ? * ({shared_tags_sql})
+                                     + ? * (e.host_club IN ({club_placeholders}))
+                                     + ? / (1.0 + max(julianday(e.start_ts) - julianday(?), 0) / 7.0) AS score
+                              FROM events e {where_sql}
+                              ORDER BY score DESC, e.start_ts, e.id
+                              LIMIT ? '''
+        params = [self.RECOMMEND_TAG_WEIGHT, *interest_bits, self.RECOMMEND_CLUB_WEIGHT, *user_clubs,
+                  self.RECOMMEND_SOON_WEIGHT, now, *where_params, limit]
+
+        try:
+            c = self.conn.cursor()
+            c.execute(sql_recommend, params)
+            return [self._row_to_event(row) for row in c.fetchall()]
+        except Error as e:
+            print(e)
+            return []
+
+    @staticmethod
+    def _fts_query(text):
+        """
+        Turns free text from the search box into an FTS5 query: each word is quoted, so
+        characters like '-' or '"' can't be read as FTS5 syntax. Only the last word is matched
+        as a prefix (it may still be being typed): a prefix term has to merge the postings of
+        every word it expands to, which is slow for common words.
+        """
+        words = re.findall(r"\w+", text or "")
+        return " ".join([f'"{word}"' for word in words[:-1]] + [f'"{word}"*' for word in words[-1:]])
+
+    @staticmethod
+    def _build_event_filters(tags, clubs, date_from, date_to, upcoming, ids=None, tag_mode="any",
+                             conditions=(), params=()):
+        """
+        Builds the WHERE clause and its parameters for query_events.
+        conditions/params can pass in extra conditions that are ANDed with the filters.
+        """
+        conditions = list(conditions)
+        params = list(params)
+
+        if ids is not None:
+            placeholders = ",".join("?" for _ in ids)
+            conditions.append(f"e.id IN ({placeholders})")
+            params += list(ids)
+
+        # Tags are matched on the tag_mask column, a bitwise test on the row itself
+        if tags:
+            mask = tag_mask(tags)
+            if mask == 0 or (tag_mode == "all" and any(tag not in TAG_BITS for tag in tags)):
+                # Tags outside INTEREST_TAGS have no bit and no event carries them. A zero mask
+                # would make the "all" test below match every event
+                conditions.append("0")
+            elif tag_mode == "all":
+                conditions.append("e.tag_mask & ? = ?")
+                params += [mask, mask]
+            else:
+                conditions.append("e.tag_mask & ? != 0")
+                params.append(mask)
+
+        if clubs:
+            placeholders = ",".join("?" for _ in clubs)
+            conditions.append(f"e.host_club IN ({placeholders})")
+            params += list(clubs)
+
+        # start_ts is an ISO string, so whole days compare as string ranges on the index
+        if date_from:
+            conditions.append("e.start_ts >= ?")
+            params.append(str(date_from))
+        if date_to:
+            next_day = date.fromisoformat(str(date_to)) + timedelta(days=1)
+            conditions.append("e.start_ts < ?")
+            params.append(next_day.isoformat())
+
+        if upcoming is True:
+            conditions.append("e.start_ts >= ?")
+            params.append(date.today().isoformat())
+        elif upcoming is False:
+            conditions.append("e.start_ts < ?")
+            params.append(date.today().isoformat())
+
+        where_sql = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        return where_sql, params
+
+    @staticmethod
+    def _sync_tags(c, table, key_column, key, tags):
+        """
+        Makes the interest_tag rows of table for key match tags, as part of the caller's transaction.
+        Only the difference is written: tags already stored are left alone, so saving an
+        unchanged list costs one SELECT and no writes.
+        """
+        c.execute(f"SELECT interest_tag FROM {table} WHERE {key_column} = ?", (key,))
+        current = {row[0] for row in c.fetchall()}
+        wanted = set(tags or ())
+
+        c.executemany(f"DELETE FROM {table} WHERE {key_column} = ? AND interest_tag = ?",
+                      [(key, tag) for tag in current - wanted])
+        c.executemany(f"INSERT INTO {table}({key_column}, interest_tag) VALUES (?, ?)",
+                      [(key, tag) for tag in wanted - current])
+
+    @staticmethod
+    def _row_to_event(row):
+        """Converts a row from query_events into an event dictionary."""
+        return {
+            "id": row[0],
+            "name": row[1],
+            "club": row[2],
+            "description": row[3],
+            "time": row[4],
+            "location": row[5],
+            "start": row[6],
+            "end": row[7],
+            "tags": row[8].split("\x1f") if row[8] else []
+        }
+
+    @cached_read
     def get_events_name_by_user_email(self, email: str):
         """
         Need to fully impliment clubs. Once they are this method will only return the events run by clubs that they user is a part of
@@ -335,20 +1143,22 @@ class DBManager:
             print(e)
             return []
 
-    def get_event_data_by_event_name(self, event_name: str):
-        sql_event = ''' SELECT event_name, host_club, description, time_frame, location, id FROM events WHERE event_name = ? '''
-
+    def get_event_by_id(self, event_id):
+        """Gets one event, with its tags, by its primary key. Returns an event dictionary or None."""
+        sql_event = ''' SELECT e.id, e.event_name, e.host_club, e.description, e.time_frame, e.location,
+                               e.start_ts, e.end_ts,
+                               (SELECT group_concat(interest_tag, char(31))
+                                FROM event_interests WHERE event_id = e.id) AS tags
+                        FROM events e WHERE e.id = ? '''
 
         try:
             c = self.conn.cursor()
-            # This line will be changed so don't bother making it a variable
-            c.execute(sql_event, (event_name,))
-            event = c.fetchone()
-
-            return event
+            c.execute(sql_event, (event_id,))
+            row = c.fetchone()
+            return self._row_to_event(row) if row else None
         except Error as e:
             print(e)
-            return []
+            return None
 
     def get_tags_by_event_id(self, event_id: str):
         """Get all tags associated with a given event id"""
@@ -363,6 +1173,7 @@ class DBManager:
             print(e)
             return []
 
+    @invalidates_cache
     def update_event(self, id, event_name, host_club, description, time, location, tags):
         """Update an existing event and its associated tags."""
         sql_update_event = ''' UPDATE events
@@ -370,21 +1181,21 @@ class DBManager:
                        host_club = ?,
                        description = ?,
                        time_frame = ?,
-                       location = ?
+                       location = ?,
+                       start_ts = ?,
+                       end_ts = ?,
+                       tag_mask = ?
                        WHERE id = ? '''
-        sql_delete_tags = ''' DELETE FROM event_interests WHERE event_id = ? '''
-        sql_insert_tag = ''' INSERT INTO event_interests(event_id, interest_tag) VALUES(?, ?) '''
 
         try:
             c = self.conn.cursor()
             # Update event row
-            c.execute(sql_update_event, (event_name, host_club, description, time, location, id))
+            start_ts, end_ts = parse_time_frame(time)
+            c.execute(sql_update_event, (event_name, host_club, description, time, location,
+                                         start_ts, end_ts, tag_mask(tags), id))
 
-            # Replace tags: remove old ones, then insert new ones
-            c.execute(sql_delete_tags, (id,))
-            if tags:
-                for tag in tags:
-                    c.execute(sql_insert_tag, (id, tag))
+            # Only write the tags that were added or removed
+            self._sync_tags(c, "event_interests", "event_id", id, tags)
 
             self.conn.commit()
             return True
@@ -393,8 +1204,10 @@ class DBManager:
             return False
         except Error as e:
             print(e)
+            self.conn.rollback()
             return False
 
+    @invalidates_cache
     def delete_event(self, event_id):
         """Deletes an event by ID."""
         sql = "DELETE FROM events WHERE id = ?"
@@ -405,6 +1218,7 @@ class DBManager:
             return True
         except Error as e:
             print(f"Error deleting event: {e}")
+            self.conn.rollback()
             return False
 
     def get_events_by_user(self):
@@ -424,6 +1238,7 @@ class DBManager:
             print(e)
             return False
 
+    @invalidates_cache
     def update_user_clubs(self, user_email, new_club_list):
         """
         Updates user club memberships but PRESERVES existing roles (like 'admin').
@@ -447,12 +1262,47 @@ class DBManager:
                     return "AdminConstraint"
 
             # Remove clubs user 
-            for club in to_remove:
-                c.execute("DELETE FROM user_clubs WHERE user_email = ? AND club = ?", (user_email, club))
+            c.executemany("DELETE FROM user_clubs WHERE user_email = ? AND club = ?",
+                          [(user_email, club) for club in to_remove])
 
             # Add new clubs (default to 'member')
-            for club in to_add:
-                c.execute("INSERT INTO user_clubs (user_email, club, role) VALUES (?, ?, 'member')", (user_email, club))
+            c.executemany("INSERT INTO user_clubs (user_email, club, role) VALUES (?, ?, 'member')",
+                          [(user_email, club) for club in to_add])
+
+            self.conn.commit()
+            return True
+        except Error as e:
+            print(e)
+            self.conn.rollback()
+            return False
+
+    @invalidates_cache
+    def update_club_members(self, club, members=(), remove=()):
+        """
+        Adds, updates and removes many members of one club in a single transaction.
+        members is a list of (email, role) pairs: new members are added with role ('member'
+        if role is None), existing ones get the new role (or keep theirs if role is None).
+        remove is a list of emails to take out of the club.
+        Like update_user_clubs, admins can't be removed or demoted this way: returns
+        "AdminConstraint" (and changes nothing) if that's asked for, else True/False.
+        """
+        sql_upsert = ''' INSERT INTO user_clubs(user_email, club, role) VALUES (?, ?, COALESCE(?, 'member'))
+                         ON CONFLICT(user_email, club) DO UPDATE SET role = COALESCE(?, role) '''
+        sql_remove = "DELETE FROM user_clubs WHERE user_email = ? AND club = ?"
+
+        try:
+            c = self.conn.cursor()
+            c.execute("BEGIN IMMEDIATE")
+
+            c.execute("SELECT user_email FROM user_clubs WHERE club = ? AND role = 'admin'", (club,))
+            admins = {row[0] for row in c.fetchall()}
+            demoted = [email for email, role in members if role not in (None, 'admin') and email in admins]
+            if demoted or any(email in admins for email in remove):
+                self.conn.rollback()
+                return "AdminConstraint"
+
+            c.executemany(sql_remove, [(email, club) for email in remove])
+            c.executemany(sql_upsert, [(email, club, role, role) for email, role in members])
 
             self.conn.commit()
             return True
@@ -461,6 +1311,23 @@ class DBManager:
             self.conn.rollback()
             return False
 
+    def get_registered_emails(self, emails):
+        """Returns the set of the given emails that have an account."""
+        emails = list(emails)
+        found = set()
+        try:
+            c = self.conn.cursor()
+            # Stay well under SQLite's limit on query parameters
+            for start in range(0, len(emails), 500):
+                chunk = emails[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                c.execute(f"SELECT email FROM users WHERE email IN ({placeholders})", chunk)
+                found.update(row[0] for row in c.fetchall())
+            return found
+        except Error as e:
+            print(e)
+            return set()
+
     def is_club_admin(self, user_email, club_name):
         """Checks if the user is an admin of the club."""
         sql = "SELECT role FROM user_clubs WHERE user_email = ? AND club = ?"
@@ -475,12 +1342,12 @@ class DBManager:
             print(e)
             return False
 
-    def get_user_clubs(self, email):
-        """Gets user clubs for a given email."""
-        sql_tags = ''' SELECT club FROM user_clubs WHERE user_email = ? '''
+    def get_user_clubs(self, email, role=None):
+        """Gets user clubs for a given email, only the ones where they have role if it's given."""
+        sql_tags = ''' SELECT club FROM user_clubs WHERE user_email = ? AND (? IS NULL OR role = ?) '''
         try:
             c = self.conn.cursor()
-            c.execute(sql_tags, (email,))
+            c.execute(sql_tags, (email, role, role))
             rows = c.fetchall()
             clubs = [row[0] for row in rows] # flatten list of tuples
             return clubs
@@ -500,6 +1367,7 @@ class DBManager:
             print(e)
             return []
 
+    @cached_read
     def get_events_by_clubs(self, clubs):
         """Gets events associated with a given club."""
         # Return empty list if no clubs provided
@@ -511,7 +1379,7 @@ class DBManager:
             clubs = [clubs]
 
         placeholders = ",".join("?" for _ in clubs)
-        sql = f"SELECT event_name, time_frame, location, host_club FROM events WHERE host_club IN ({placeholders}) ORDER BY time_frame"
+        sql = f"SELECT event_name, time_frame, location, host_club, start_ts, id FROM events WHERE host_club IN ({placeholders}) ORDER BY start_ts"
 
         try:
             c = self.conn.cursor()
@@ -528,13 +1396,16 @@ class DBManager:
                     "name": row[0],
                     "time": row[1],
                     "location": row[2],
-                    "club": row[3]
+                    "club": row[3],
+                    "start": row[4],
+                    "id": row[5]
                 })
             return events_data
         except Error as e:
             print(e)
             return []
 
+    @cached_read
     def get_events_by_user_email(self, email):
         """Get events associated with a given email."""
         clubs = self.get_user_clubs(email)
@@ -542,6 +1413,70 @@ class DBManager:
         return events
 
 
-
-
-db = DBManager()
\ No newline at end of file
+# The shared DBManager is created on first use, not at import, so importing this module
+# doesn't touch the disk. Where it points is taken from configure() if it was called,
+# otherwise from the environment:
+#   EVENTS_DB            database file, or ":memory:" (default "events.db")
+#   EVENTS_DB_READ_ONLY  "1" to open it read-only
+#   EVENTS_DB_TRACE      "1" to record query timings, see db_trace
+DB_PATH_ENV = "EVENTS_DB"
+DB_READ_ONLY_ENV = "EVENTS_DB_READ_ONLY"
+DB_TRACE_ENV = "EVENTS_DB_TRACE"
+
+_db = None
+_db_options = None
+_db_lock = threading.Lock()
+
+
+def configure(db_file=None, read_only=None, **options):
+    """
+    Sets up the shared DBManager returned by get_db() (and used through db).
+    db_file/read_only default to the environment, other options are passed to DBManager.
+    If the shared instance already exists it is replaced; existing callers holding the old
+    instance keep using it.
+    """
+    global _db, _db_options
+    options = _resolve_options(db_file, read_only, options)
+    with _db_lock:
+        _db_options = options
+        _db = None
+
+
+def _resolve_options(db_file, read_only, options):
+    """DBManager arguments for configure(), with db_file/read_only taken from the environment if not given."""
+    if db_file is None:
+        db_file = os.environ.get(DB_PATH_ENV) or "events.db"
+    if read_only is None:
+        read_only = os.environ.get(DB_READ_ONLY_ENV, "").lower() in ("1", "true", "yes")
+    return dict(options, db_file=db_file, read_only=read_only)
+
+
+def get_db():
+    """Returns the shared DBManager, creating it (and running migrations) on first call."""
+    global _db, _db_options
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                # Not configured: use the environment. Done under the lock, and without resetting
+                # _db, so concurrent first calls all get the same instance
+                if _db_options is None:
+                    _db_options = _resolve_options(None, None, {})
+                manager = DBManager(**_db_options)
+                if os.environ.get(DB_TRACE_ENV):
+                    import db_trace
+                    db_trace.enable(manager)
+                _db = manager
+    return _db
+
+
+class _LazyDB:
+    """Stand-in for the shared DBManager that creates it on first attribute access, see get_db()."""
+
+    def __getattr__(self, name):
+        return getattr(get_db(), name)
+
+    def __repr__(self):
+        return f"<lazy DBManager {_db.db_file!r}>" if _db is not None else "<lazy DBManager (not opened yet)>"
+
+
+db = _LazyDB()
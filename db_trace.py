@@ -0,0 +1,260 @@
+"""
+Opt-in instrumentation for DBManager: call counts, latency percentiles and rows returned for
+every DBManager method and every SQL statement, a slow-query log with EXPLAIN QUERY PLAN
+output, and a report printed when the program exits.
+
+Turn it on for the app by setting EVENTS_DB_TRACE=1 (see database.get_db), or for any
+DBManager with enable(manager). Optional settings:
+    EVENTS_DB_SLOW_MS       statements taking at least this long are logged (default 50)
+    EVENTS_DB_TRACE_REPORT  file to write the exit report to (default: stderr)
+
+Statements are grouped by their SQL with whitespace collapsed and "?, ?, ?" lists folded,
+so one query with different IN (...) lengths is one row. A statement's time includes its
+fetches, since SQLite does most of a SELECT's work while rows are fetched. Methods are also
+grouped by trace context: the DBWorker job key (e.g. "calendar-feed") they ran under, which
+shows which screens drive the load.
+"""
+import atexit
+import collections
+import contextlib
+import functools
+import inspect
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+SLOW_MS_ENV = "EVENTS_DB_SLOW_MS"
+REPORT_ENV = "EVENTS_DB_TRACE_REPORT"
+DEFAULT_SLOW_MS = 50
+
+_context = threading.local()
+
+
+@contextlib.contextmanager
+def trace_context(name):
+    """Labels the DBManager calls made on this thread inside the block, e.g. with a DBWorker job key."""
+    previous = getattr(_context, "name", None)
+    _context.name = name
+    try:
+        yield
+    finally:
+        _context.name = previous
+
+
+def current_context():
+    return getattr(_context, "name", None) or threading.current_thread().name
+
+
+class Stats:
+    """Call count, total time, rows and recent latency samples for one method or statement."""
+    SAMPLE_LIMIT = 10_000  # Percentiles are computed over the most recent samples
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0  # seconds
+        self.rows = 0
+        self.samples = collections.deque(maxlen=self.SAMPLE_LIMIT)  # one [seconds] list per call
+
+    def percentile(self, p):
+        """Nearest-rank percentile of the samples, in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(sample[0] for sample in self.samples)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+class QueryTracer:
+    def __init__(self, slow_ms=DEFAULT_SLOW_MS, log=None):
+        self.slow_ms = slow_ms
+        self.log = log or sys.stderr
+        self.lock = threading.Lock()
+        self.methods = collections.defaultdict(Stats)  # method name -> Stats
+        self.statements = collections.defaultdict(Stats)  # normalized SQL -> Stats
+        self.contexts = collections.defaultdict(Stats)  # (trace context, method name) -> Stats
+        self.slow_queries = collections.deque(maxlen=100)  # (milliseconds, sql, plan lines)
+
+        tracer = self
+
+        class TracingConnection(sqlite3.Connection):
+            def cursor(self, factory=None):
+                return super().cursor(factory or TracingCursor)
+
+        class TracingCursor(sqlite3.Cursor):
+            def execute(self, sql, parameters=()):
+                start = time.perf_counter()
+                try:
+                    return super().execute(sql, parameters)
+                finally:
+                    self._trace = tracer.begin_statement(self.connection, sql, parameters,
+                                                         time.perf_counter() - start)
+
+            def executemany(self, sql, seq_of_parameters):
+                start = time.perf_counter()
+                try:
+                    return super().executemany(sql, seq_of_parameters)
+                finally:
+                    self._trace = tracer.begin_statement(self.connection, sql, None,
+                                                         time.perf_counter() - start, rows=max(self.rowcount, 0))
+
+            def fetchone(self):
+                return self._timed_fetch(super().fetchone, single=True)
+
+            def fetchmany(self, size=None):
+                return self._timed_fetch(lambda: super(TracingCursor, self).fetchmany(size or self.arraysize))
+
+            def fetchall(self):
+                return self._timed_fetch(super().fetchall)
+
+            def __next__(self):
+                return self._timed_fetch(super().__next__, single=True)
+
+            def _timed_fetch(self, fetch, single=False):
+                start = time.perf_counter()
+                result = fetch()
+                rows = (result is not None) if single else len(result)
+                trace = getattr(self, "_trace", None)
+                if trace is not None:
+                    tracer.add_fetch(self.connection, trace, time.perf_counter() - start, rows)
+                return result
+
+        self.connection_class = TracingConnection
+
+    def attach(self, manager):
+        """Times manager's methods and every statement run on connections it opens from now on."""
+        manager.connection_factory = self.connection_class
+        # The connection opened while creating the manager isn't traced, open a new one on next use
+        manager.close()
+
+        # Look the methods up on the class, so properties like conn aren't evaluated
+        for name, function in inspect.getmembers(type(manager), inspect.isfunction):
+            if not name.startswith("_") and not inspect.isgeneratorfunction(function):
+                setattr(manager, name, self.wrap_method(name, getattr(manager, name)))
+        return manager
+
+    def wrap_method(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = None
+            try:
+                result = method(*args, **kwargs)
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                rows = len(result) if isinstance(result, (list, tuple, dict)) else 0
+                with self.lock:
+                    for stats in (self.methods[name], self.contexts[(current_context(), name)]):
+                        stats.count += 1
+                        stats.total += elapsed
+                        stats.rows += rows
+                        stats.samples.append([elapsed])
+        return wrapper
+
+    def begin_statement(self, connection, sql, parameters, elapsed, rows=0):
+        """Records the execute() of a statement. Returns the trace its fetches are added to."""
+        key = normalize_sql(sql)
+        sample = [elapsed]
+        with self.lock:
+            stats = self.statements[key]
+            stats.count += 1
+            stats.total += elapsed
+            stats.rows += rows
+            stats.samples.append(sample)
+        trace = {"key": key, "sql": sql, "parameters": parameters, "sample": sample, "logged": False}
+        self.check_slow(connection, trace)
+        return trace
+
+    def add_fetch(self, connection, trace, elapsed, rows):
+        with self.lock:
+            stats = self.statements[trace["key"]]
+            stats.total += elapsed
+            stats.rows += rows
+            trace["sample"][0] += elapsed
+        self.check_slow(connection, trace)
+
+    def check_slow(self, connection, trace):
+        """Logs a statement, with its query plan, the first time it goes over slow_ms."""
+        milliseconds = trace["sample"][0] * 1000
+        if trace["logged"] or milliseconds < self.slow_ms:
+            return
+        trace["logged"] = True
+
+        plan = []
+        if trace["parameters"] is not None and re.match(r"\s*(SELECT|WITH|UPDATE|DELETE|INSERT)", trace["sql"], re.I):
+            try:
+                # A plain Connection.execute, so the EXPLAIN itself isn't traced
+                rows = sqlite3.Connection.execute(connection, "EXPLAIN QUERY PLAN " + trace["sql"],
+                                                  trace["parameters"]).fetchall()
+                plan = [row[-1] for row in rows]
+            except sqlite3.Error as e:
+                plan = [f"(no plan: {e})"]
+
+        with self.lock:
+            self.slow_queries.append((milliseconds, trace["key"], plan))
+        print(f"[db_trace] slow query ({milliseconds:.1f} ms, {current_context()}): {trace['key']}", file=self.log)
+        for line in plan:
+            print(f"[db_trace]     {line}", file=self.log)
+
+    def report(self, limit=25):
+        """Returns the collected statistics as text, slowest (by total time) first."""
+        with self.lock:
+            lines = ["DBManager trace report", ""]
+            lines += self._table("Methods", self.methods, limit)
+            lines += self._table("Methods by context", {f"{context} / {name}": stats for (context, name), stats
+                                                        in self.contexts.items()}, limit)
+            lines += self._table("Statements", self.statements, limit)
+            lines.append(f"Slow queries (>= {self.slow_ms} ms): {len(self.slow_queries)} logged")
+            for milliseconds, sql, plan in sorted(self.slow_queries, reverse=True)[:limit]:
+                lines.append(f"  {milliseconds:9.1f} ms  {sql}")
+                lines += [f"               {line}" for line in plan]
+        return "\n".join(lines)
+
+    @staticmethod
+    def _table(title, stats_by_name, limit):
+        lines = [title, f"  {'calls':>7} {'total ms':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rows':>9}  name"]
+        ranked = sorted(stats_by_name.items(), key=lambda item: item[1].total, reverse=True)
+        for name, stats in ranked[:limit]:
+            lines.append(f"  {stats.count:>7} {stats.total * 1000:>10.1f} {stats.percentile(50) * 1000:>8.2f} "
+                         f"{stats.percentile(95) * 1000:>8.2f} {stats.percentile(99) * 1000:>8.2f} "
+                         f"{stats.rows:>9}  {shorten_sql(name)}")
+        if len(ranked) > limit:
+            lines.append(f"  ... {len(ranked) - limit} more")
+        lines.append("")
+        return lines
+
+    def write_report(self, path=None):
+        text = self.report()
+        if path:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text, file=self.log)
+
+
+def normalize_sql(sql):
+    sql = " ".join(sql.split())
+    return re.sub(r"\?(\s*,\s*\?)+", "?, ...", sql)
+
+
+def shorten_sql(sql, limit=120):
+    return sql if len(sql) <= limit else sql[:limit - 3] + "..."
+
+
+def enable(manager, slow_ms=None, report_path=None):
+    """
+    Starts tracing manager and prints (or writes to report_path) a report when the program exits.
+    slow_ms and report_path default to EVENTS_DB_SLOW_MS and EVENTS_DB_TRACE_REPORT.
+    Returns the QueryTracer.
+    """
+    if slow_ms is None:
+        slow_ms = float(os.environ.get(SLOW_MS_ENV, DEFAULT_SLOW_MS))
+    if report_path is None:
+        report_path = os.environ.get(REPORT_ENV)
+
+    tracer = QueryTracer(slow_ms)
+    tracer.attach(manager)
+    atexit.register(tracer.write_report, report_path)
+    return tracer
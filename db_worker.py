@@ -0,0 +1,105 @@
+import queue
+import threading
+import traceback
+
+from db_trace import trace_context
+
+
+class DBWorker:
+    """
+    Runs database work on a dedicated thread, so the Tk mainloop never waits on SQLite.
+    DBManager opens a separate connection for the worker thread.
+
+    Jobs are functions that receive the DBManager. Their results are handed
+    back to the Tk thread by a polling after() loop, where the job's callback is called.
+    If a job raises, its callback gets the exception instead of a result, so callers can
+    recover (re-enable buttons, show an error) rather than wait forever.
+    Jobs submitted with a key supersede older jobs with the same key: a superseded job
+    is skipped if it hasn't started yet, and its result is dropped if it has.
+    """
+    POLL_MS = 20
+
+    def __init__(self, root, manager):
+        self.root = root
+        self.manager = manager
+
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+
+        self.lock = threading.Lock()
+        self.next_ticket = 0
+        self.latest = {}  # key -> ticket of the newest job submitted with that key
+
+        self.thread = threading.Thread(target=self.run, name="db-worker", daemon=True)
+        self.thread.start()
+        self.root.after(self.POLL_MS, self.poll)
+
+    def submit(self, job, callback=None, key=None):
+        """
+        Queues job(manager) to run on the worker thread.
+        callback(result) is called on the Tk thread once it finishes, unless superseded.
+        result is the exception if job raised.
+        """
+        with self.lock:
+            self.next_ticket += 1
+            ticket = self.next_ticket
+            if key is not None:
+                self.latest[key] = ticket
+
+        self.jobs.put((ticket, key, job, callback))
+        return ticket
+
+    def cancel(self, key):
+        """Drops any pending job or undelivered result submitted with key."""
+        with self.lock:
+            self.latest.pop(key, None)
+
+    def is_current(self, ticket, key):
+        with self.lock:
+            return key is None or self.latest.get(key) == ticket
+
+    def run(self):
+        """Worker thread loop."""
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                break
+
+            ticket, key, job, callback = item
+            if not self.is_current(ticket, key):
+                continue  # A newer job with the same key is queued
+
+            try:
+                # Tags the job's DBManager calls with its key when db_trace is on
+                with trace_context(key or "db-worker"):
+                    result = job(self.manager)
+            except Exception as e:
+                traceback.print_exc()
+                result = e
+
+            self.results.put((ticket, key, callback, result))
+
+        self.manager.close()
+
+    def poll(self):
+        """Delivers finished results on the Tk thread."""
+        try:
+            while True:
+                try:
+                    ticket, key, callback, result = self.results.get_nowait()
+                except queue.Empty:
+                    break
+
+                if not self.is_current(ticket, key):
+                    continue  # Superseded while it was running
+
+                with self.lock:
+                    self.latest.pop(key, None)
+                if callback is not None:
+                    callback(result)
+        finally:
+            self.root.after(self.POLL_MS, self.poll)
+
+    def stop(self):
+        """Lets the worker thread finish the job it is on and exit."""
+        self.jobs.put(None)
@@ -1,6 +1,7 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from database import db
+from event_import import import_events
 from constants import INTEREST_TAGS
 from tkcalendar import DateEntry
 from datetime import date
@@ -109,6 +110,8 @@ class EventCreationPage(tk.Frame):
         button_frame.pack(pady=20)
         tk.Button(button_frame, text="Post Event", command=self.post_event,
                   width=15, bg="#0066AA", fg="white", font=("Arial", 10, "bold")).pack(side="left", padx=10)
+        self.import_button = tk.Button(button_frame, text="Import from File...", command=self.import_file, width=15)
+        self.import_button.pack(side="left", padx=10)
         tk.Button(button_frame, text="Cancel", command=lambda: controller.show_frame("CalendarPage"),
                   width=15).pack(side="left", padx=10)
 
@@ -180,6 +183,32 @@ class EventCreationPage(tk.Frame):
         else:
             messagebox.showerror("Error", "Could not post event.")
 
+    def import_file(self):
+        """Imports a CSV or .ics file of events. .ics events without an X-CLUB go to the selected Host Club."""
+        path = filedialog.askopenfilename(title="Import Events",
+                                          filetypes=[("Event files", "*.csv *.ics"), ("All files", "*.*")])
+        if not path:
+            return
+
+        email = self.controller.current_user_email
+        club = self.club_var.get()
+        if club == "No Clubs Found":
+            club = None
+
+        # A failed import (unreadable file, malformed CSV, ...) reaches finish_import as the exception
+        self.import_button.configure(state="disabled", text="Importing...")
+        self.controller.db_worker.submit(lambda manager: import_events(path, email, club, manager=manager),
+                                         self.finish_import, key="event-import")
+
+    def finish_import(self, report):
+        self.import_button.configure(state="normal", text="Import from File...")
+        if isinstance(report, Exception):
+            messagebox.showerror("Import Failed", str(report))
+        elif report.imported:
+            messagebox.showinfo("Import Finished", report.summary())
+        else:
+            messagebox.showerror("Import Failed", report.summary())
+
     def clear_fields(self):
         self.name_entry.delete(0, tk.END)
         self.location_entry.delete(0, tk.END)
@@ -0,0 +1,95 @@
+"""
+Export of events to an iCalendar (.ics) file that other calendar apps can import or subscribe to.
+
+Events are streamed from DBManager.iter_events and written as they are read, so memory use
+doesn't grow with the number of events exported. Each VEVENT carries an X-CLUB property
+with the host club, so an exported file can be imported again with event_import.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+import ical
+from database import db
+
+PRODUCT_ID = "-//Club Events Calendar//EN"
+UID_DOMAIN = "events-calendar.local"  # Fixed, so an event keeps its UID whichever machine exports it
+
+
+def export_events(path, manager=db, calendar_name="Club Events", **filters):
+    """
+    Writes the events matching filters (the same keywords as DBManager.query_events) to path.
+    The file is written next to path first and moved into place at the end, so a calendar app
+    subscribed to it never reads a half-written feed. Returns the number of events exported.
+    """
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="") as f:
+            count = write_calendar(f, manager.iter_events(**filters), calendar_name)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return count
+
+
+def export_user_events(path, user_email, manager=db, **filters):
+    """Exports the events of every club the user belongs to."""
+    clubs = manager.get_user_clubs(user_email)
+    if not clubs:
+        # An empty clubs filter means "all clubs", but this user has none
+        return export_events(path, manager, ids=[], **filters)
+    return export_events(path, manager, clubs=clubs, **filters)
+
+
+def write_calendar(f, events, calendar_name="Club Events"):
+    """Writes a VCALENDAR with one VEVENT per event to the text file f. Returns the number of events."""
+    f.write(ical.format_property("BEGIN", "VCALENDAR"))
+    f.write(ical.format_property("VERSION", "2.0"))
+    f.write(ical.format_property("PRODID", PRODUCT_ID))
+    f.write(ical.format_property("CALSCALE", "GREGORIAN"))
+    f.write(ical.format_property("X-WR-CALNAME", ical.escape_text(calendar_name)))
+
+    stamp = ical.format_date_time(datetime.now(timezone.utc)) + "Z"
+    count = 0
+    for event in events:
+        f.write(format_vevent(event, stamp))
+        count += 1
+
+    f.write(ical.format_property("END", "VCALENDAR"))
+    return count
+
+
+def format_vevent(event, stamp):
+    """Returns the VEVENT lines for one event dictionary from DBManager."""
+    lines = [
+        ical.format_property("BEGIN", "VEVENT"),
+        ical.format_property("UID", f"event-{event['id']}@{UID_DOMAIN}"),
+        ical.format_property("DTSTAMP", stamp),
+    ]
+
+    if event['start']:
+        # start/end are stored in TIMESTAMP_FORMAT, which fromisoformat reads (and much faster than strptime)
+        start = datetime.fromisoformat(event['start'])
+        end = datetime.fromisoformat(event['end']) if event['end'] else start
+        if start == end and start.hour == 0 and start.minute == 0:
+            # Only the date of the time_frame could be parsed; export as an all-day event
+            lines.append(ical.format_property("DTSTART", ical.format_date_time(start, all_day=True),
+                                              {"VALUE": "DATE"}))
+            lines.append(ical.format_property("DTEND", ical.format_date_time(start + timedelta(days=1), all_day=True),
+                                              {"VALUE": "DATE"}))
+        else:
+            lines.append(ical.format_property("DTSTART", ical.format_date_time(start)))
+            lines.append(ical.format_property("DTEND", ical.format_date_time(end)))
+
+    lines.append(ical.format_property("SUMMARY", ical.escape_text(event['name'])))
+    if event['location']:
+        lines.append(ical.format_property("LOCATION", ical.escape_text(event['location'])))
+    if event['description']:
+        lines.append(ical.format_property("DESCRIPTION", ical.escape_text(event['description'])))
+    if event['tags']:
+        lines.append(ical.format_property("CATEGORIES", ",".join(ical.escape_text(tag) for tag in event['tags'])))
+    if event['club']:
+        lines.append(ical.format_property("X-CLUB", ical.escape_text(event['club'])))
+
+    lines.append(ical.format_property("END", "VEVENT"))
+    return "".join(lines)
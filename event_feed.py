@@ -0,0 +1,246 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class EventFeed(tk.Frame):
+    """
+    Scrollable list of event cards that only builds widgets for the rows in (or near)
+    the visible part of the canvas. Every card sits in a fixed-height slot, so the
+    scrollregion can be sized from the row count before any row has been fetched.
+    Rows are fetched one page at a time as the user scrolls, asynchronously, and a page
+    is drawn when it arrives.
+
+    Cards that leave the viewport (or belong to a previous result set) are hidden and
+    reconfigured with the next event instead of being destroyed and rebuilt.
+    """
+    HEADER_HEIGHT = 50
+    CARD_HEIGHT = 170  # Slot height, including the gap between cards
+    CARD_PADDING = 10
+    PAGE_SIZE = 50
+    OVERSCAN = 3  # Extra cards to keep built above and below the viewport
+    MAX_IDLE_CARDS = 20  # Hidden cards kept around for reuse
+
+    def __init__(self, parent):
+        super().__init__(parent, bg="white")
+
+        self.total = 0
+        self.fetch_page = None
+        self.pages = {}  # page number -> list of event dictionaries
+        self.pending_pages = set()  # page numbers requested but not yet delivered
+        self.generation = 0  # bumped on every load() so late pages of an old result set are dropped
+        self.cards = {}  # row index -> (EventCard, canvas window id)
+        self.idle_cards = []  # hidden (EventCard, canvas window id) pairs ready for reuse
+
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        # Header for the feed
+        self.header_label = tk.Label(self.canvas, text="Upcoming Events", font=("Arial", 16), bg="white")
+        self.canvas.create_window(20, 10, window=self.header_label, anchor="nw")
+
+        self.empty_label = tk.Label(self.canvas, text="No events found matching your filters.",
+                                    fg="gray", bg="white")
+        self.empty_window = self.canvas.create_window(20, self.HEADER_HEIGHT + 10, window=self.empty_label,
+                                                      anchor="nw", state="hidden")
+
+        self.canvas.bind("<Configure>", self.on_resize)
+
+    def set_header(self, text):
+        self.header_label.config(text=text)
+
+    def load(self, total, fetch_page, first_page=None):
+        """
+        Shows a new result set.
+        total:      number of rows in the result set
+        fetch_page: callable(offset, limit, callback) that fetches that slice of the rows
+                    and passes it to callback, possibly later
+        first_page: the first PAGE_SIZE rows, if the caller already has them
+        """
+        self.clear_cards()
+        self.total = total
+        self.fetch_page = fetch_page
+        self.generation += 1
+        self.pages = {} if first_page is None else {0: first_page}
+        self.pending_pages = set()
+
+        self.canvas.itemconfigure(self.empty_window, state="hidden" if total else "normal")
+        self.update_scrollregion()
+        self.canvas.yview_moveto(0)
+        self.render_visible()
+
+    def update_scrollregion(self):
+        height = self.HEADER_HEIGHT + self.total * self.CARD_HEIGHT + self.CARD_PADDING
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height))
+
+    def on_scroll(self, first, last):
+        """yscrollcommand of the canvas: keep the scrollbar in sync and build newly visible cards."""
+        self.scrollbar.set(first, last)
+        self.render_visible()
+
+    def on_resize(self, event):
+        self.update_scrollregion()
+        for _, window in self.cards.values():
+            self.canvas.itemconfigure(window, width=self.card_width())
+        self.render_visible()
+
+    def card_width(self):
+        return max(self.canvas.winfo_width() - 4 * self.CARD_PADDING, 200)
+
+    def visible_range(self):
+        """Returns the (first, last) row indexes to keep built, last exclusive."""
+        top = self.canvas.canvasy(0) - self.HEADER_HEIGHT
+        bottom = top + self.canvas.winfo_height()
+        first = max(0, int(top // self.CARD_HEIGHT) - self.OVERSCAN)
+        last = min(self.total, int(bottom // self.CARD_HEIGHT) + 1 + self.OVERSCAN)
+        return first, last
+
+    def render_visible(self):
+        """Releases cards that scrolled out of range and fills the slots that scrolled in."""
+        if not self.total:
+            return
+        first, last = self.visible_range()
+
+        for index in [i for i in self.cards if not first <= i < last]:
+            self.release_card(self.cards.pop(index))
+
+        for index in range(first, last):
+            if index in self.cards:
+                continue
+            event = self.get_row(index)
+            if event is None:
+                continue
+            self.cards[index] = self.acquire_card(index, event)
+
+        self.trim_pool()
+
+    def acquire_card(self, index, event):
+        """Places a card showing event in the slot for row index, reusing an idle card if there is one."""
+        y = self.HEADER_HEIGHT + index * self.CARD_HEIGHT
+        if self.idle_cards:
+            card, window = self.idle_cards.pop()
+            self.canvas.coords(window, 2 * self.CARD_PADDING, y)
+            self.canvas.itemconfigure(window, state="normal", width=self.card_width())
+        else:
+            card = EventCard(self.canvas)
+            window = self.canvas.create_window(2 * self.CARD_PADDING, y, window=card, anchor="nw",
+                                               width=self.card_width(),
+                                               height=self.CARD_HEIGHT - self.CARD_PADDING)
+        card.show(event)
+        return card, window
+
+    def release_card(self, entry):
+        """Hides a card and keeps it for reuse instead of destroying it."""
+        _, window = entry
+        self.canvas.itemconfigure(window, state="hidden")
+        self.idle_cards.append(entry)
+
+    def trim_pool(self):
+        """Destroys idle cards beyond MAX_IDLE_CARDS, e.g. after the window was made smaller."""
+        while len(self.idle_cards) > self.MAX_IDLE_CARDS:
+            card, window = self.idle_cards.pop()
+            self.canvas.delete(window)
+            card.destroy()
+
+    def get_row(self, index):
+        """Returns the event at a row index, or None if its page hasn't arrived yet (it is requested)."""
+        page = index // self.PAGE_SIZE
+        if page not in self.pages:
+            self.request_page(page)
+            return None
+        rows = self.pages[page]
+        offset = index % self.PAGE_SIZE
+        return rows[offset] if offset < len(rows) else None
+
+    def request_page(self, page):
+        if page in self.pending_pages:
+            return
+        self.pending_pages.add(page)
+        generation = self.generation
+        self.fetch_page(page * self.PAGE_SIZE, self.PAGE_SIZE,
+                        lambda rows: self.on_page_loaded(generation, page, rows))
+
+    def on_page_loaded(self, generation, page, rows):
+        if generation != self.generation:
+            return  # Belongs to a result set that has since been replaced
+        self.pending_pages.discard(page)
+        if isinstance(rows, Exception):
+            return  # Not stored, so the page is requested again when it is next rendered
+        self.pages[page] = rows
+        self.render_visible()
+
+    def loaded_events(self):
+        """Events in the pages fetched so far, by id."""
+        return {row['id']: row for rows in self.pages.values() for row in rows}
+
+    def update_rows(self, events):
+        """Swaps in newer versions of already loaded events and redraws the cards showing them."""
+        by_id = {event['id']: event for event in events}
+        for page, rows in self.pages.items():
+            # Build new lists rather than editing rows in place, they may be shared with DBManager's cache
+            self.pages[page] = [by_id.get(row['id'], row) for row in rows]
+
+        for index, (card, _) in self.cards.items():
+            card.show(self.get_row(index))
+
+    def clear_cards(self):
+        for entry in self.cards.values():
+            self.release_card(entry)
+        self.cards = {}
+
+
+class EventCard(tk.Frame):
+    """Visual card for a single event. Built once, then pointed at different events with show()."""
+
+    def __init__(self, parent):
+        super().__init__(parent, bg="#f9f9f9", bd=1, relief="solid")
+
+        # Header: Name and Time
+        header = tk.Frame(self, bg="#e0e0e0")
+        header.pack(fill="x")
+
+        self.name_label = tk.Label(header, font=("Arial", 12, "bold"), bg="#e0e0e0")
+        self.name_label.pack(side="left", padx=10, pady=5)
+        self.time_label = tk.Label(header, font=("Arial", 10, "italic"), bg="#e0e0e0")
+        self.time_label.pack(side="right", padx=10)
+
+        # Body: Club and Location
+        body = tk.Frame(self, bg="#f9f9f9")
+        body.pack(fill="x", padx=10, pady=5)
+
+        self.club_label = tk.Label(body, fg="#003366", bg="#f9f9f9")
+        self.club_label.pack(anchor="w")
+        self.location_label = tk.Label(body, fg="#555", bg="#f9f9f9")
+        self.location_label.pack(anchor="w")
+
+        # Description
+        self.description_label = tk.Label(body, wraplength=400, justify="left", bg="#f9f9f9")
+        self.description_label.pack(anchor="w", pady=5)
+
+        # Tags Footer (only packed when the event has tags)
+        self.tags_label = tk.Label(self, bg="#f9f9f9", fg="blue", font=("Arial", 8))
+
+    def show(self, event):
+        """Fills the card with the given event's details."""
+        self.name_label.config(text=event['name'])
+        self.time_label.config(text=event['time'])
+        self.club_label.config(text=f"Hosted by: {event['club']}")
+        self.location_label.config(text=f"📍 {event['location']}")
+        # Cards have a fixed height, so long descriptions are shortened
+        self.description_label.config(text=shorten(event['description'], 160))
+
+        if event['tags']:
+            tags_str = " | ".join(event['tags'])
+            self.tags_label.config(text=f"Tags: {tags_str}")
+            self.tags_label.pack(anchor="w", padx=10, pady=(0, 5))
+        else:
+            self.tags_label.pack_forget()
+
+
+def shorten(text, limit):
+    """Cuts text down to at most limit characters, ending with an ellipsis if it was cut."""
+    text = text or ""
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
@@ -0,0 +1,219 @@
+"""
+Bulk import of events from CSV and iCalendar (.ics) files.
+
+Files are read as a stream, each row is validated the way EventCreationPage.post_event
+validates the form (club membership, interest tags, no past dates), and valid rows are
+inserted in batches with DBManager.bulk_create_events.
+
+CSV files need a header row with these columns (tags are separated by ';'):
+    name, club, date, start_time, end_time, location, description, tags
+e.g. "Math Party,Math Society,2025-11-25,6:00 PM,20:00,IB 110,Snacks and puzzles,Free Food;Social"
+
+In .ics files each VEVENT becomes an event: SUMMARY, DTSTART, DTEND, LOCATION, DESCRIPTION
+and CATEGORIES (tags). The host club is read from an X-CLUB property, falling back to the
+club passed to the importer.
+"""
+import csv
+import os
+import re
+import time
+from datetime import date, time as dt_time, timedelta
+
+import ical
+from constants import INTEREST_TAGS
+from database import db, format_time_frame
+
+BATCH_SIZE = 5000
+
+# Tags are matched case-insensitively and stored with INTEREST_TAGS' spelling
+TAG_LOOKUP = {tag.lower(): tag for tag in INTEREST_TAGS}
+
+CLOCK_PATTERN = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*(AM|PM)?")
+
+
+class ImportReport:
+    """Outcome of an import: how many events were added and which rows were rejected."""
+
+    def __init__(self, noun="events"):
+        self.noun = noun
+        self.imported = 0
+        self.errors = []  # (row or line number, message)
+        self.elapsed = 0.0  # seconds
+
+    @property
+    def rows_per_second(self):
+        processed = self.imported + len(self.errors)
+        return processed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self, max_errors=10):
+        lines = [f"Imported {self.imported} {self.noun}, rejected {len(self.errors)} rows "
+                 f"({self.rows_per_second:,.0f} rows/s)."]
+        for row, message in self.errors[:max_errors]:
+            lines.append(f"Row {row}: {message}")
+        if len(self.errors) > max_errors:
+            lines.append(f"... and {len(self.errors) - max_errors} more errors.")
+        return "\n".join(lines)
+
+
+def import_events(path, user_email, club=None, manager=db, batch_size=BATCH_SIZE):
+    """Imports a .csv or .ics file, picked by its extension. Returns an ImportReport."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return import_events_csv(path, user_email, manager, batch_size)
+    if extension in (".ics", ".ical"):
+        return import_events_ics(path, user_email, club, manager, batch_size)
+    raise ValueError(f"Unsupported file type: {extension or path}")
+
+
+def import_events_csv(path, user_email, manager=db, batch_size=BATCH_SIZE):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        rows = ((reader.line_num, _fields_from_csv(record)) for record in reader)
+        return _load(rows, user_email, manager, batch_size)
+
+
+def import_events_ics(path, user_email, club=None, manager=db, batch_size=BATCH_SIZE):
+    with open(path, encoding="utf-8-sig") as f:
+        # Lines iter_vevents couldn't parse come through as ValueErrors and are reported by _load
+        rows = ((line, properties if isinstance(properties, ValueError) else _fields_from_vevent(properties, club))
+                for line, properties in ical.iter_vevents(f))
+        return _load(rows, user_email, manager, batch_size)
+
+
+def _load(rows, user_email, manager, batch_size):
+    """
+    Validates (row number, fields) pairs and inserts the valid ones in batches.
+    fields may also be a ValueError, for a row that couldn't be parsed at all.
+    """
+    report = ImportReport()
+    start = time.perf_counter()
+
+    user_clubs = set(manager.get_user_clubs(user_email))
+    today = date.today()
+    batch = []
+    batch_rows = []
+
+    for row_number, fields in rows:
+        try:
+            if isinstance(fields, ValueError):
+                raise fields
+            batch.append(_validate(fields, user_clubs, today))
+            batch_rows.append(row_number)
+        except ValueError as e:
+            report.errors.append((row_number, str(e)))
+            continue
+
+        if len(batch) >= batch_size:
+            _flush(batch, batch_rows, manager, report)
+
+    _flush(batch, batch_rows, manager, report)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _flush(batch, batch_rows, manager, report):
+    if not batch:
+        return
+    if manager.bulk_create_events(batch):
+        report.imported += len(batch)
+    else:
+        report.errors.extend((row, "Database rejected this batch") for row in batch_rows)
+    batch.clear()
+    batch_rows.clear()
+
+
+def _validate(fields, user_clubs, today):
+    """Checks one row and returns it as a bulk_create_events tuple. Raises ValueError if it's invalid."""
+    name = (fields.get("name") or "").strip()
+    location = (fields.get("location") or "").strip()
+    club = (fields.get("club") or "").strip()
+    if not name or not location:
+        raise ValueError("Event name and location are required")
+    if club not in user_clubs:
+        raise ValueError(f"You are not a member of the club '{club}'")
+
+    day = fields.get("date")
+    if day is None:
+        raise ValueError("Missing or invalid date")
+    if day < today:
+        raise ValueError("Events cannot be created in the past")
+    start, end = fields.get("start"), fields.get("end")
+    if start is None or end is None:
+        raise ValueError("Missing or invalid start/end time")
+
+    tags = []
+    for tag in fields.get("tags", []):
+        canonical = TAG_LOOKUP.get(tag.strip().lower())
+        if canonical is None:
+            raise ValueError(f"Unknown tag '{tag}'")
+        if canonical not in tags:
+            tags.append(canonical)
+
+    description = (fields.get("description") or "").strip()
+    return name, club, description, format_time_frame(day, start, end), location, tags
+
+
+def _fields_from_csv(record):
+    return {
+        "name": record.get("name"),
+        "club": record.get("club"),
+        "date": _parse_date(record.get("date")),
+        "start": _parse_clock(record.get("start_time")),
+        "end": _parse_clock(record.get("end_time")),
+        "location": record.get("location"),
+        "description": record.get("description"),
+        "tags": [tag for tag in (record.get("tags") or "").split(";") if tag.strip()],
+    }
+
+
+def _fields_from_vevent(properties, default_club):
+    def text(name):
+        values = properties.get(name)
+        return ical.unescape_text(values[0][1]) if values else None
+
+    fields = {
+        "name": text("SUMMARY"),
+        "club": text("X-CLUB") or default_club,
+        "location": text("LOCATION"),
+        "description": text("DESCRIPTION"),
+        "tags": [tag for _, value in properties.get("CATEGORIES", []) for tag in ical.split_text_list(value)],
+    }
+
+    try:
+        params, value = properties["DTSTART"][0]
+        start, all_day = ical.parse_date_time(value, params)
+        if "DTEND" in properties:
+            params, value = properties["DTEND"][0]
+            end, _ = ical.parse_date_time(value, params)
+        else:
+            end = start
+        if all_day:
+            # DTEND of an all-day event is the (exclusive) next day
+            end = start + timedelta(hours=23, minutes=59)
+    except (KeyError, ValueError):
+        return fields
+
+    fields.update(date=start.date(), start=start.time(), end=end.time())
+    return fields
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat((value or "").strip())
+    except ValueError:
+        return None
+
+
+def _parse_clock(value):
+    """Parses "18:00", "6:00 PM", "6:00PM" or "6 PM". Returns None if it's none of those."""
+    match = CLOCK_PATTERN.fullmatch((value or "").strip().upper())
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == "PM" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return dt_time(hour, minute)
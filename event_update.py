@@ -121,24 +121,24 @@ class EventUpdatePage(tk.Frame):
             self.club_var.set("No Clubs")
 
         # Populate Data
-        if self.controller.selected_event:
-            event_data = db.get_event_data_by_event_name(self.controller.selected_event)
-            if not event_data: return
+        if self.controller.selected_event_id is not None:
+            # Primary-key lookup, tags included
+            event = db.get_event_by_id(self.controller.selected_event_id)
+            if not event: return
 
-            # event_data structure from DB: (name, host_club, desc, time, location, id)
-            self.event_id = event_data[5]
+            self.event_id = event["id"]
 
             self.name_entry.delete(0, tk.END)
-            self.name_entry.insert(0, event_data[0])
-            self.club_var.set(event_data[1])
+            self.name_entry.insert(0, event["name"])
+            self.club_var.set(event["club"])
             self.description_text.delete("1.0", tk.END)
-            self.description_text.insert("1.0", event_data[2])
+            self.description_text.insert("1.0", event["description"] or "")
             self.location_entry.delete(0, tk.END)
-            self.location_entry.insert(0, event_data[4])
+            self.location_entry.insert(0, event["location"] or "")
 
             # Time Parsing
             try:
-                time_field = event_data[3]  # "2025-11-25 | 6:00 PM - 8:00 PM"
+                time_field = event["time"]  # "2025-11-25 | 6:00 PM - 8:00 PM"
                 parts = [p.strip() for p in time_field.split("|", 1)]
                 if parts:
                     self.date_picker.set_date(parts[0])
@@ -162,8 +162,7 @@ class EventUpdatePage(tk.Frame):
                 pass  # If format changed, just leave defaults
 
             # Tags
-            tags = db.get_tags_by_event_id(self.event_id)
-            selected_tags = set(tags) if tags else set()
+            selected_tags = set(event["tags"])
             for tag, var in self.tag_vars:
                 var.set(1 if tag in selected_tags else 0)
 
@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from database import db
 
 
 class EventUpdateSelectionPage(tk.Frame):
@@ -10,8 +9,8 @@ class EventUpdateSelectionPage(tk.Frame):
 
         self.columnconfigure(0, weight=1)
 
-        # Dictionary to map "Display String" -> "Event Name"
-        self.name_map = {}
+        # Id of the event picked in the dropdown
+        self.selected_event_id = None
 
         tk.Label(self, text="Select an Event to Update", font=("Arial", 18, "bold")).pack(pady=20)
 
@@ -44,43 +43,39 @@ class EventUpdateSelectionPage(tk.Frame):
         email = self.controller.current_user_email
         if not email: return
 
-        # Clear existing map
-        self.name_map = {}
+        # Fetch list of dictionaries from DB on the worker thread
+        self.controller.db_worker.submit(lambda manager: manager.get_events_by_user_email(email),
+                                         self.show_events, key="update-select-events")
 
-        # Fetch list of dictionaries from DB
-        events_data = db.get_events_by_user_email(email)
+    def show_events(self, events_data):
+        self.selected_event_id = None
 
         menu = self.dropdown["menu"]
         menu.delete(0, "end")  # Clear dropdown
 
-        if not events_data:
+        if isinstance(events_data, Exception) or not events_data:
             self.selected_display_str.set("No Events Found")
             self.dropdown.configure(state="disabled")
             return
 
         self.dropdown.configure(state="normal")
 
-        # Set default to first item
-        first_display = ""
-
         for i, evt in enumerate(events_data):
             # Create a detailed string for the user to see
             # Format: "Math Party | Robotics Club | 2025-11-01... | IB 110"
             display_str = f"{evt['name']} | {evt['club']} | {evt['time']} | {evt['location']}"
 
-            # Save mapping: Display String -> Real Name
-            self.name_map[display_str] = evt['name']
-
-            # Add to menu
+            # Each entry carries its event id, so events with the same details stay apart
             menu.add_command(label=display_str,
-                             command=tk._setit(self.selected_display_str, display_str))
+                             command=lambda d=display_str, event_id=evt['id']: self.choose_event(d, event_id))
 
+            # Set default to first item
             if i == 0:
-                first_display = display_str
+                self.choose_event(display_str, evt['id'])
 
-        # Set default selection
-        if first_display:
-            self.selected_display_str.set(first_display)
+    def choose_event(self, display_str, event_id):
+        self.selected_display_str.set(display_str)
+        self.selected_event_id = event_id
 
     def select_event(self):
         display_str = self.selected_display_str.get()
@@ -89,11 +84,8 @@ class EventUpdateSelectionPage(tk.Frame):
             messagebox.showerror("Error", "No event selected.")
             return
 
-        # Retrieve the simple event name using map
-        real_event_name = self.name_map.get(display_str)
-
-        if real_event_name:
-            self.controller.selected_event = real_event_name
+        if self.selected_event_id is not None:
+            self.controller.selected_event_id = self.selected_event_id
             self.controller.show_frame("EventUpdatePage")
         else:
             messagebox.showerror("Error", "Could not find event details.")
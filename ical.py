@@ -0,0 +1,182 @@
+"""
+Minimal iCalendar (RFC 5545) helpers for importing and exporting events.
+Only the parts needed for VEVENTs are handled: line (un)folding, properties with
+parameters, TEXT escaping and DATE / DATE-TIME values.
+"""
+from datetime import datetime, timezone
+
+
+def unfold_lines(lines):
+    """
+    Joins folded content lines (continuations start with a space or tab).
+    Yields (line_number, line) where line_number is where the logical line starts.
+    """
+    current = None
+    start = 0
+    for number, raw in enumerate(lines, start=1):
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and current is not None:
+            current += raw[1:]
+            continue
+        if current is not None:
+            yield start, current
+        current = raw
+        start = number
+    if current:
+        yield start, current
+
+
+def parse_property(line):
+    """Splits 'NAME;PARAM=value:VALUE' into (NAME, {PARAM: value}, VALUE)."""
+    # The value starts at the first ':' that isn't inside a quoted parameter value
+    in_quotes = False
+    for i, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        raise ValueError(f"Not an iCalendar property: {line!r}")
+
+    name, *param_parts = head.split(";")
+    params = {}
+    for part in param_parts:
+        key, _, param_value = part.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def iter_vevents(lines):
+    """
+    Streams the VEVENTs of a calendar, one at a time.
+    Yields (line_number, properties) with properties mapping NAME -> list of (params, value).
+    Properties of components nested in a VEVENT (e.g. a VALARM's DESCRIPTION) are skipped.
+    A line that isn't a valid property doesn't stop the stream: properties is then a
+    ValueError describing it, for the VEVENT containing the line, or for the line itself
+    if it is outside any VEVENT.
+    """
+    properties = None
+    nested = []  # Names of the components open inside the current VEVENT
+    error = None
+    start = 0
+    for number, line in unfold_lines(lines):
+        if not line.strip():
+            continue
+        try:
+            name, params, value = parse_property(line)
+        except ValueError as e:
+            if properties is None:
+                yield number, e
+            elif error is None:
+                error = ValueError(f"Line {number}: {e}")
+            continue
+
+        component = value.strip().upper()
+        if properties is None:
+            if name == "BEGIN" and component == "VEVENT":
+                properties = {}
+                nested = []
+                error = None
+                start = number
+        elif name == "BEGIN":
+            nested.append(component)
+        elif name == "END" and component in nested:
+            # Closes the component, and any left open inside it
+            while nested.pop() != component:
+                pass
+        elif name == "END" and component == "VEVENT":
+            yield start, error or properties
+            properties = None
+        elif not nested:
+            properties.setdefault(name, []).append((params, value))
+
+
+def unescape_text(value):
+    """Undoes TEXT escaping: \\n, \\, \\; and \\\\."""
+    out = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            nxt = next(chars, "")
+            out.append("\n" if nxt in ("n", "N") else nxt)
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def split_text_list(value):
+    """Splits a comma separated TEXT list (e.g. CATEGORIES), leaving escaped commas alone."""
+    items = []
+    current = []
+    escaped = False
+    for char in value:
+        if escaped:
+            current.append("\\" + char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ",":
+            items.append(unescape_text("".join(current)))
+            current = []
+        else:
+            current.append(char)
+    items.append(unescape_text("".join(current)))
+    return [item.strip() for item in items if item.strip()]
+
+
+def parse_date_time(value, params):
+    """
+    Parses a DATE or DATE-TIME value into a naive local datetime.
+    UTC values (ending in 'Z') are converted to local time; TZID values are taken as local
+    wall-clock time. Returns (datetime, all_day).
+    """
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d"), True
+
+    if value.endswith("Z"):
+        utc = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None), False
+    return datetime.strptime(value, "%Y%m%dT%H%M%S"), False
+
+
+def escape_text(value):
+    """Applies TEXT escaping, the reverse of unescape_text."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold_line(line, limit=75):
+    """
+    Folds a content line into lines of at most limit octets, continuations starting with a space.
+    Returns the folded line with CRLF line endings.
+    """
+    if len(line) <= limit and line.isascii():
+        return line + "\r\n"
+    encoded = line.encode("utf-8")
+    if len(encoded) <= limit:
+        return line + "\r\n"
+
+    parts = []
+    start = 0
+    width = limit
+    while start < len(encoded):
+        end = min(start + width, len(encoded))
+        # Don't split a multi-byte character: back up to the start of it
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        width = limit - 1  # Continuation lines lose one octet to the leading space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_property(name, value, params=None):
+    """Builds a folded 'NAME;PARAM=value:VALUE' content line."""
+    head = name + "".join(f";{key}={param}" for key, param in (params or {}).items())
+    return fold_line(f"{head}:{value}")
+
+
+def format_date_time(value, all_day=False):
+    """Formats a datetime as a DATE-TIME in floating local time, or a date as a DATE if all_day."""
+    return value.strftime("%Y%m%d") if all_day else value.strftime("%Y%m%dT%H%M%S")
@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import messagebox
-from database import db
 
 
 class LoginPage(tk.Frame):
@@ -25,8 +24,9 @@ class LoginPage(tk.Frame):
         self.pass_entry.pack(pady=5)
 
         # Buttons
-        tk.Button(center_frame, text="Login", command=self.validate_login,
-                  width=20, bg="#003366", fg="white").pack(pady=20)
+        self.login_button = tk.Button(center_frame, text="Login", command=self.validate_login,
+                                      width=20, bg="#003366", fg="white")
+        self.login_button.pack(pady=20)
         # # Checkbox
         # tk.Checkbutton(center_frame, text="Stay Logged in:", variable=self.stay_logged_in).pack()
 
@@ -50,15 +50,19 @@ class LoginPage(tk.Frame):
 
         # Check validation
         if email and password:
-            user_email = db.check_credentials(email, password)
+            # bcrypt runs on the auth service's thread pool, so the window stays responsive
+            self.login_button.configure(state="disabled")
+            self.controller.auth.login(email, password, lambda user_email: self.finish_login(email, user_email))
+        else:
+            messagebox.showerror("Error", "Please enter email and password")
 
-            if user_email:
-                messagebox.showinfo("Login Success", f"Welcome back, {email}!")
-                self.controller.login_success(user_email)
+    def finish_login(self, email, user_email):
+        self.login_button.configure(state="normal")
+        if user_email:
+            messagebox.showinfo("Login Success", f"Welcome back, {email}!")
+            self.controller.login_success(user_email)
 
-                # Clear username and password
-                self.clear_fields()
-            else:
-                messagebox.showerror("Login Failed", "Invalid email or password.")
+            # Clear username and password
+            self.clear_fields()
         else:
-            messagebox.showerror("Error", "Please enter email and password")
\ No newline at end of file
+            messagebox.showerror("Login Failed", "Invalid email or password.")
\ No newline at end of file
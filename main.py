@@ -1,19 +1,44 @@
+import time
+
+STARTUP_BEGIN = time.perf_counter()
+
+import importlib
+import os
 import tkinter as tk
 
-from login_view import LoginPage
-from register_view import RegisterPage
-from calendar_view import CalendarPage
-from event_creation import EventCreationPage
-from event_update import EventUpdatePage
-from account_view import AccountPage
-from event_update_select import EventUpdateSelectionPage
-from club_management import ClubManagement
-from club_creation import ClubCreation
+from database import db
+from db_worker import DBWorker
+from auth_service import AuthService
+from ui_profiler import UIProfiler
+
+STARTUP_IMPORTS_DONE = time.perf_counter()
+
+# Page name -> (module, class). Pages are imported and built the first time they're shown,
+# so startup only pays for LoginPage (and modules like tkcalendar load when a page needs them).
+PAGES = {
+    "LoginPage": ("login_view", "LoginPage"),
+    "RegisterPage": ("register_view", "RegisterPage"),
+    "CalendarPage": ("calendar_view", "CalendarPage"),
+    "EventCreationPage": ("event_creation", "EventCreationPage"),
+    "EventUpdatePage": ("event_update", "EventUpdatePage"),
+    "EventUpdateSelectionPage": ("event_update_select", "EventUpdateSelectionPage"),
+    "AccountPage": ("account_view", "AccountPage"),
+    "ClubManagement": ("club_management", "ClubManagement"),
+    "ClubCreation": ("club_creation", "ClubCreation"),
+}
 
 
 class EventsCalendarApp(tk.Tk):
+    CHANGE_POLL_MS = 2000  # How often to check for changes made by other clients
+    CHANGE_PRUNE_MS = 10 * 60 * 1000  # How often to trim the change log
+    BCRYPT_ROUNDS = AuthService.DEFAULT_ROUNDS  # Work factor for password hashes, see AuthService
+
     def __init__(self):
         super().__init__()
+        # Startup phase -> seconds, printed by report_startup when EVENTS_STARTUP_REPORT is set
+        self.startup_times = {"imports": STARTUP_IMPORTS_DONE - STARTUP_BEGIN}
+        self.page_build_times = {}  # page name -> seconds its first show_frame spent building it
+
         self.title("UTM Events Calendar")
         self.geometry("1000x600")
 
@@ -27,26 +52,95 @@ class EventsCalendarApp(tk.Tk):
         self.container.grid_columnconfigure(0, weight=1)
 
         self.current_user_email = None
-        self.selected_event = None
+        self.selected_event_id = None
         self.frames = {}
+        self.current_page = None
+
+        # Page timings and widget counts; F12 opens the stats panel
+        self.profiler = UIProfiler(self)
+        self.bind_all("<F12>", self.profiler.toggle_panel)
 
-        # Loop through view screens
-        for F in (LoginPage, RegisterPage, CalendarPage, EventCreationPage, EventUpdatePage, EventUpdateSelectionPage, AccountPage, ClubManagement, ClubCreation):
-            page_name = F.__name__
-            frame = F(parent=self.container, controller=self)
+        # Pages send their database work here instead of calling db on the Tk thread
+        self.db_worker = DBWorker(self, db)
+        # Password hashing runs on its own thread pool, so a login doesn't queue behind feed queries
+        self.auth = AuthService(self, db, rounds=self.BCRYPT_ROUNDS)
+
+        # Newest change_log version this client has applied, read on the worker so opening
+        # the database doesn't hold up the first window
+        self.change_version = None
+        self.change_data_version = None  # PRAGMA data_version the last applied poll saw
+        self.db_worker.submit(lambda manager: (manager.prune_change_log(), manager.get_change_version())[1],
+                              self.start_change_polling)
+
+        self.startup_times["app setup"] = time.perf_counter() - STARTUP_IMPORTS_DONE
+        self.show_frame("LoginPage")
+        self.startup_times["LoginPage"] = self.page_build_times["LoginPage"]
+        # Runs once the login screen has been drawn
+        self.after_idle(self.report_startup)
+
+    def get_frame(self, page_name):
+        """Returns the page, importing and building it the first time it's asked for."""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            start = time.perf_counter()
+            module_name, class_name = PAGES[page_name]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            frame = page_class(parent=self.container, controller=self)
             self.frames[page_name] = frame
 
             # sticky="nsew" makes the specific page fill the container
             frame.grid(row=0, column=0, sticky="nsew")
-
-        self.show_frame("LoginPage")
+            self.page_build_times[page_name] = time.perf_counter() - start
+            self.profiler.record(page_name, "build", self.page_build_times[page_name])
+        return frame
 
     def show_frame(self, page_name):
-        frame = self.frames[page_name]
+        frame = self.get_frame(page_name)
+        self.current_page = page_name
         frame.tkraise()
         if hasattr(frame, "on_show"):
-            frame.on_show()
-
+            with self.profiler.measure(page_name, "on_show"):
+                frame.on_show()
+        self.profiler.count_widgets(page_name, frame)
+
+    def report_startup(self):
+        self.update_idletasks()
+        self.startup_times["time to login screen"] = time.perf_counter() - STARTUP_BEGIN
+        if os.environ.get("EVENTS_STARTUP_REPORT"):
+            print("Startup times:")
+            for phase, seconds in self.startup_times.items():
+                print(f"  {phase:<22} {seconds * 1000:8.1f} ms")
+
+    def start_change_polling(self, version):
+        if isinstance(version, Exception):
+            version = 0  # Catch up from the start of the change log on the first poll
+        self.change_version = version
+        self.after(self.CHANGE_POLL_MS, self.poll_changes)
+        self.after(self.CHANGE_PRUNE_MS, self.prune_changes)
+
+    def prune_changes(self):
+        """Keeps change_log from growing forever, see DBManager.prune_change_log."""
+        self.db_worker.submit(lambda manager: manager.prune_change_log(), key="change-prune")
+        self.after(self.CHANGE_PRUNE_MS, self.prune_changes)
+
+    def poll_changes(self):
+        """Asks the DB worker for changes other clients committed since change_version."""
+        version, data_version = self.change_version, self.change_data_version
+        self.db_worker.submit(lambda manager: manager.poll_changes(version, data_version), self.apply_changes,
+                              key="change-poll")
+        self.after(self.CHANGE_POLL_MS, self.poll_changes)
+
+    def apply_changes(self, result):
+        if isinstance(result, Exception):
+            return  # Try again on the next poll
+        self.change_version, changes, self.change_data_version = result
+        frame = self.frames.get(self.current_page)
+        if any(op == "reset" for _, _, _, op in changes):
+            # We fell behind a pruned change log, reload the page instead
+            if hasattr(frame, "on_show"):
+                frame.on_show()
+        elif changes and hasattr(frame, "apply_changes"):
+            frame.apply_changes(changes)
 
     def login_success(self, email):
         self.current_user_email = email
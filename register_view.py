@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-from database import db
 from constants import INTEREST_TAGS
-import bcrypt
 
 class RegisterPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -48,18 +46,15 @@ class RegisterPage(tk.Frame):
             chk.grid(row=row, column=col, sticky="w", padx=10)
 
         # Buttons
-        tk.Button(self, text="Sign Up", command=self.register_user, width=15, bg="#4CAF50", fg="white").pack(pady=20)
+        self.sign_up_button = tk.Button(self, text="Sign Up", command=self.register_user, width=15, bg="#4CAF50",
+                                        fg="white")
+        self.sign_up_button.pack(pady=20)
         tk.Button(self, text="Back", command=lambda: controller.show_frame("LoginPage")).pack()
 
     def register_user(self):
         name = self.name_entry.get()
         email = self.email_entry.get()
-
-        # encrypt password
-        s = bcrypt.gensalt()
         password = self.pass_entry.get()
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), s)
-        password = hashed_password
 
         interests = []
         for tag, var in self.interest_vars:
@@ -68,12 +63,22 @@ class RegisterPage(tk.Frame):
 
         # interests passed as a list of strings
         if name and email and password:
-            success = db.register_user(name, email, password, interests)
+            if self.controller.auth.password_too_long(password):
+                messagebox.showwarning("Password Too Long",
+                                       f"Passwords can be at most {self.controller.auth.MAX_PASSWORD_BYTES} bytes long.")
+                return
+
+            # The password is hashed off the Tk thread, see AuthService
+            self.sign_up_button.configure(state="disabled")
+            self.controller.auth.register(name, email, password, interests,
+                                          lambda success: self.finish_register(name, success))
+        else:
+            messagebox.showwarning("Missing Info", "Please fill in all required fields.")
 
-            if success:
-                messagebox.showinfo("Success", f"Account created for {name}!")
-                self.controller.show_frame("LoginPage")
-            else:
-                messagebox.showerror("Error", "Registration failed. Email may already be in use.")
+    def finish_register(self, name, success):
+        self.sign_up_button.configure(state="normal")
+        if success:
+            messagebox.showinfo("Success", f"Account created for {name}!")
+            self.controller.show_frame("LoginPage")
         else:
-            messagebox.showwarning("Missing Info", "Please fill in all required fields.")
\ No newline at end of file
+            messagebox.showerror("Error", "Registration failed. Email may already be in use.")
\ No newline at end of file
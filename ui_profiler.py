@@ -0,0 +1,137 @@
+"""
+Lightweight timing of the Tk pages: how long each page takes to build and show, how long
+its DB worker jobs wait and render, and how many widgets it holds.
+
+EventsCalendarApp owns a UIProfiler (controller.profiler). Pages time synchronous work with
+    with self.controller.profiler.measure("CalendarPage", "refresh_events"):
+and DB worker callbacks with
+    worker.submit(job, profiler.track("CalendarPage", "feed", callback))
+which records both the time until the result arrived ("feed.wait") and the time the
+callback took on the Tk thread ("feed.render").
+
+Press F12 for a stats panel of the most recent samples. Set EVENTS_UI_PROFILE_LOG to a file
+path to also append every sample to it as a JSON line.
+"""
+import collections
+import contextlib
+import json
+import os
+import time
+import tkinter as tk
+from tkinter import ttk
+
+LOG_ENV = "EVENTS_UI_PROFILE_LOG"
+
+
+class UIProfiler:
+    WINDOW = 100  # Samples kept per (page, phase) for the stats panel
+    PANEL_REFRESH_MS = 1000
+
+    def __init__(self, root, log_path=None):
+        self.root = root
+        self.samples = collections.defaultdict(lambda: collections.deque(maxlen=self.WINDOW))
+        self.widget_counts = {}  # page -> live widgets the last time it was shown
+        self.log_path = log_path if log_path is not None else os.environ.get(LOG_ENV)
+        self.panel = None
+
+    def record(self, page, phase, seconds):
+        self.samples[(page, phase)].append(seconds)
+        self.log({"page": page, "phase": phase, "ms": round(seconds * 1000, 3)})
+
+    @contextlib.contextmanager
+    def measure(self, page, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(page, phase, time.perf_counter() - start)
+
+    def track(self, page, phase, callback):
+        """Wraps a DB worker callback so the wait for its result and the callback itself are recorded."""
+        submitted = time.perf_counter()
+
+        def timed_callback(result):
+            start = time.perf_counter()
+            self.record(page, phase + ".wait", start - submitted)
+            try:
+                return callback(result)
+            finally:
+                self.record(page, phase + ".render", time.perf_counter() - start)
+
+        return timed_callback
+
+    def count_widgets(self, page, frame):
+        """Records how many widgets frame holds (including itself). Returns the count."""
+        count = 0
+        pending = [frame]
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.winfo_children())
+        self.widget_counts[page] = count
+        self.log({"page": page, "widgets": count})
+        return count
+
+    def log(self, entry):
+        if not self.log_path:
+            return
+        entry = {"time": round(time.time(), 3), **entry}
+        try:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(e)
+            self.log_path = None  # Don't retry (and print) on every sample
+
+    def summary(self):
+        """Returns (page, phase, calls, last ms, p50 ms, p95 ms, max ms) rows, slowest p95 first."""
+        rows = []
+        for (page, phase), samples in self.samples.items():
+            ordered = sorted(samples)
+            rows.append((page, phase, len(samples), samples[-1] * 1000,
+                         ordered[len(ordered) // 2] * 1000,
+                         ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                         ordered[-1] * 1000))
+        rows.sort(key=lambda row: row[5], reverse=True)
+        return rows
+
+    def toggle_panel(self, event=None):
+        if self.panel is not None and self.panel.winfo_exists():
+            self.panel.destroy()
+            self.panel = None
+        else:
+            self.panel = StatsPanel(self.root, self)
+
+
+class StatsPanel(tk.Toplevel):
+    """Window showing the profiler's rolling stats, refreshed every PANEL_REFRESH_MS."""
+    COLUMNS = ("page", "phase", "calls", "last", "p50", "p95", "max")
+
+    def __init__(self, root, profiler):
+        super().__init__(root)
+        self.profiler = profiler
+        self.title("UI Performance Stats")
+        self.geometry("700x400")
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings")
+        for column in self.COLUMNS:
+            label = column if column in ("page", "phase", "calls") else f"{column} (ms)"
+            self.tree.heading(column, text=label)
+            self.tree.column(column, width=160 if column in ("page", "phase") else 70, anchor="w")
+        self.tree.pack(fill="both", expand=True)
+
+        self.widgets_label = tk.Label(self, anchor="w", justify="left")
+        self.widgets_label.pack(fill="x", padx=5, pady=5)
+
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for page, phase, calls, last, p50, p95, worst in self.profiler.summary():
+            self.tree.insert("", "end", values=(page, phase, calls, f"{last:.1f}", f"{p50:.1f}",
+                                                f"{p95:.1f}", f"{worst:.1f}"))
+        counts = ", ".join(f"{page}: {count}" for page, count in sorted(self.profiler.widget_counts.items()))
+        self.widgets_label.config(text=f"Live widgets: {counts or '-'}")
+        self.after(self.profiler.PANEL_REFRESH_MS, self.refresh)